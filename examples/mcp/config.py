@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Configuração compartilhada pelos exemplos MCP, lida uma única vez do ambiente,
+e utilitários comuns para interpretar a saída do mcpx.
+"""
+
+import os
+import sys
+import json
+from dataclasses import dataclass, fields
+from typing import Any
+
+from arcee_cli.infrastructure.env import load_env
+
+# Variável de ambiente correspondente a cada campo da configuração
+_ENV_VARS = {
+    "sse_url": "MCP_SSE_URL",
+    "mcp_session": "MCP_SESSION_ID",
+    "tess_key": "TESS_API_KEY",
+}
+
+
+@dataclass(frozen=True)
+class ExampleConfig:
+    """Variáveis de ambiente usadas pelos exemplos MCP"""
+
+    sse_url: str = ""
+    mcp_session: str = ""
+    tess_key: str = ""
+
+    @classmethod
+    def load(cls, *required: str) -> "ExampleConfig":
+        """
+        Lê a configuração do ambiente (e do arquivo .env)
+
+        Args:
+            required: Nomes dos campos obrigatórios para o exemplo
+
+        Returns:
+            Configuração carregada
+
+        Raises:
+            SystemExit: Se algum campo obrigatório não estiver configurado
+        """
+        load_env()
+        config = cls(**{
+            field.name: os.getenv(_ENV_VARS[field.name], "")
+            for field in fields(cls)
+        })
+
+        for name in required:
+            if not getattr(config, name):
+                print(f"❌ Erro: Variável de ambiente {_ENV_VARS[name]} não configurada no arquivo .env")
+                sys.exit(1)
+
+        return config
+
+
+def decode_first_json(text: str) -> Any:
+    """
+    Decodifica o primeiro objeto JSON válido do texto em uma única passada
+
+    Texto antes do objeto é ignorado e a decodificação para no fim do objeto,
+    descartando linhas de log que o mcpx escreva depois dele.
+
+    Args:
+        text: Saída do mcpx
+
+    Returns:
+        Objeto decodificado
+
+    Raises:
+        json.JSONDecodeError: Se não houver objeto JSON válido no texto
+    """
+    decoder = json.JSONDecoder()
+    first_error = None
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = decoder.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError as e:
+            first_error = first_error or e
+            start = text.find("{", start + 1)
+    raise first_error or json.JSONDecodeError("Nenhum objeto JSON encontrado", text, 0)
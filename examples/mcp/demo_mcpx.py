@@ -12,9 +12,14 @@ import logging
 import sys
 import json
 import os
+import time
+import hashlib
+import shutil
 import subprocess
 from typing import Dict, List, Any, Optional
 
+from arcee_cli.examples.mcp.config import decode_first_json
+
 # Configuração básica de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +27,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger("demo_mcpx")
 
+# Diretório de configuração e validade do cache de ferramentas
+CONFIG_DIR = os.path.expanduser("~/.arcee")
+CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+TOOLS_CACHE_TTL = 3600  # Segundos (1 hora)
+
+# Caminho absoluto do npx e close_fds=False permitem que o subprocess use
+# os.posix_spawn em vez de fork+exec, sem copiar a memória deste processo
+NPX = shutil.which("npx") or "npx"
+SPAWN_OPTIONS = {"close_fds": False}
+
+
 class MCPxDemo:
     """Cliente simplificado para demonstração do MCP.run"""
     
@@ -33,7 +49,72 @@ class MCPxDemo:
             session_id: ID de sessão opcional
         """
         self.session_id = session_id
+        self._tools_cache: Optional[List[Dict[str, Any]]] = None
+        self._tools_cache_ts = 0.0
+        self._tools_by_name: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Caminho do cache em disco das ferramentas da sessão atual"""
+        if not self.session_id:
+            return None
+        digest = hashlib.sha1(self.session_id.encode("utf-8")).hexdigest()
+        return os.path.join(CONFIG_DIR, f"tools_cache_{digest}.json")
+    
+    def _load_tools_cache(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Carrega a lista de ferramentas do cache em disco, se ainda válida
+        
+        Returns:
+            Lista de ferramentas ou None se o cache estiver ausente ou expirado
+        """
+        cache_path = self.cache_path
+        if not cache_path:
+            return None
+        try:
+            cache_mtime = os.path.getmtime(cache_path)
+            if time.time() - cache_mtime > TOOLS_CACHE_TTL:
+                return None
+            # Configuração alterada depois do cache invalida as ferramentas salvas
+            if os.path.exists(CONFIG_FILE) and os.path.getmtime(CONFIG_FILE) > cache_mtime:
+                return None
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+    
+    def _save_tools_cache(self, tools: List[Dict[str, Any]]) -> None:
+        """
+        Salva a lista de ferramentas no cache em disco de forma atômica
+        
+        Args:
+            tools: Lista de ferramentas a ser salva
+        """
+        cache_path = self.cache_path
+        if not cache_path:
+            return
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CONFIG_DIR, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(tools, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o cache de ferramentas: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
+    def _remember_tools(self, tools: List[Dict[str, Any]]) -> None:
+        """Memoriza a lista de ferramentas na instância, indexada por nome"""
+        self._tools_cache = tools
+        self._tools_cache_ts = time.monotonic()
+        self._tools_by_name = {tool["name"]: tool for tool in tools}
+    
+    def _store_tools(self, tools: List[Dict[str, Any]]) -> None:
+        """Guarda a lista de ferramentas em memória e no cache em disco"""
+        self._remember_tools(tools)
+        self._save_tools_cache(tools)
+    
     def generate_session(self) -> Optional[str]:
         """
         Gera um ID de sessão MCP.run
@@ -43,15 +124,15 @@ class MCPxDemo:
         """
         try:
             logger.info("Gerando nova sessão MCP.run...")
-            cmd = "npx --yes -p @dylibso/mcpx@latest gen-session"
-            print(f"Executando: {cmd}")
+            cmd = [NPX, "--yes", "-p", "@dylibso/mcpx@latest", "gen-session"]
+            print(f"Executando: {' '.join(cmd)}")
             
             result = subprocess.run(
                 cmd, 
-                shell=True, 
                 check=True, 
                 text=True, 
-                capture_output=True
+                capture_output=True,
+                **SPAWN_OPTIONS
             )
             
             # Extrai o ID de sessão da saída
@@ -76,10 +157,14 @@ class MCPxDemo:
             logger.exception(f"Erro ao gerar sessão MCP.run: {e}")
             return None
     
-    def list_tools(self) -> List[Dict[str, Any]]:
+    def list_tools(self, force_refresh: bool = False, max_age: float = 300) -> List[Dict[str, Any]]:
         """
         Lista as ferramentas disponíveis
         
+        Args:
+            force_refresh: Ignora os caches em memória e em disco e consulta o MCP.run
+            max_age: Idade máxima em segundos da lista memorizada na instância
+        
         Returns:
             Lista de ferramentas disponíveis
         """
@@ -88,40 +173,47 @@ class MCPxDemo:
             if not self.session_id:
                 logger.error("Nenhum ID de sessão configurado")
                 return []
-
+            
+            if not force_refresh:
+                # Usa a lista já decodificada nesta instância
+                if (self._tools_cache is not None
+                        and time.monotonic() - self._tools_cache_ts < max_age):
+                    return self._tools_cache
+                
+                # Usa o cache em disco quando disponível
+                cached = self._load_tools_cache()
+                if cached is not None:
+                    logger.info("Usando ferramentas do cache local")
+                    self._remember_tools(cached)
+                    return cached
+            
             # Executa o comando para listar ferramentas
-            cmd = f"npx mcpx tools --session {self.session_id}"
-            logger.info(f"Executando: {cmd}")
+            cmd = [NPX, "mcpx", "tools", "--session", self.session_id]
+            logger.info(f"Executando: {' '.join(cmd)}")
             
             result = subprocess.run(
                 cmd,
-                shell=True,
                 check=True,
                 text=True,
-                capture_output=True
+                capture_output=True,
+                **SPAWN_OPTIONS
             )
             
-            # Processa a saída
-            output = result.stdout
+            # Decodifica só o primeiro objeto JSON da saída, ignorando logs
             tools = []
+            try:
+                data = decode_first_json(result.stdout)
+                for name, info in data.get("tools", {}).items():
+                    tools.append({
+                        "name": name,
+                        "description": info.get("description", ""),
+                        "schema": info.get("schema", {})
+                    })
+            except json.JSONDecodeError as e:
+                logger.error(f"Erro ao decodificar JSON: {e}")
             
-            # Tenta extrair o JSON da saída
-            json_start = output.find('{')
-            if json_start >= 0:
-                json_str = output[json_start:]
-                try:
-                    data = json.loads(json_str)
-                    
-                    if "tools" in data:
-                        for name, info in data["tools"].items():
-                            tools.append({
-                                "name": name,
-                                "description": info.get("description", ""),
-                                "schema": info.get("schema", {})
-                            })
-                except json.JSONDecodeError as e:
-                    logger.error(f"Erro ao decodificar JSON: {e}")
-            
+            if tools:
+                self._store_tools(tools)
             return tools
             
         except subprocess.CalledProcessError as e:
@@ -149,39 +241,32 @@ class MCPxDemo:
             if not self.session_id:
                 logger.error("Nenhum ID de sessão configurado")
                 return {"error": "Nenhum ID de sessão configurado"}
-                
-            # Salva os parâmetros em um arquivo temporário
-            params_file = "temp_params.json"
-            with open(params_file, "w", encoding="utf-8") as f:
-                json.dump(params, f)
-                
-            # Executa o comando
-            cmd = f"npx mcpx run {tool_name} --file {params_file} --session {self.session_id}"
+            
+            # Evita iniciar o mcpx para ferramentas que não existem na sessão
+            if self._tools_by_name and tool_name not in self._tools_by_name:
+                logger.error(f"Ferramenta não encontrada: {tool_name}")
+                return {"error": f"Ferramenta não encontrada: {tool_name}"}
+            
+            # Executa o comando, passando os parâmetros diretamente sem arquivo temporário
+            cmd = [NPX, "mcpx", "run", tool_name, "--json", json.dumps(params), "--session", self.session_id]
             logger.info(f"Executando ferramenta: {tool_name}")
             logger.debug(f"Parâmetros: {params}")
-            logger.debug(f"Comando: {cmd}")
+            logger.debug(f"Comando: {' '.join(cmd)}")
             
             result = subprocess.run(
                 cmd,
-                shell=True,
                 check=True,
                 text=True,
-                capture_output=True
+                capture_output=True,
+                **SPAWN_OPTIONS
             )
             
-            # Processa a saída
+            # Decodifica só o primeiro objeto JSON da saída, ignorando logs
             output = result.stdout
-            
-            # Tenta extrair o JSON da saída
-            json_start = output.find('{')
-            if json_start >= 0:
-                json_str = output[json_start:]
-                try:
-                    data = json.loads(json_str)
-                    return data
-                except json.JSONDecodeError as e:
-                    logger.error(f"Erro ao decodificar JSON: {e}")
-            
+            try:
+                return decode_first_json(output)
+            except json.JSONDecodeError as e:
+                logger.error(f"Erro ao decodificar JSON: {e}")
             return {"error": "Formato de resposta não reconhecido", "raw_output": output}
             
         except subprocess.CalledProcessError as e:
@@ -192,10 +277,6 @@ class MCPxDemo:
         except Exception as e:
             logger.exception(f"Erro ao executar ferramenta: {e}")
             return {"error": str(e)}
-        finally:
-            # Remove o arquivo temporário se existir
-            if os.path.exists(params_file):
-                os.remove(params_file)
 
 def main():
     """Função principal de demonstração"""
@@ -203,7 +284,7 @@ def main():
     
     # Tenta carregar ID de sessão existente
     session_id = None
-    config_file = os.path.expanduser("~/.arcee/config.json")
+    config_file = CONFIG_FILE
     if os.path.exists(config_file):
         try:
             with open(config_file, "r", encoding="utf-8") as f:
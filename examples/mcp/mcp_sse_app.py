@@ -8,27 +8,39 @@ Esta aplicação conecta ao endpoint SSE do MCP.run com as credenciais fornecida
 e processa os eventos recebidos em tempo real.
 """
 
+import io
 import sys
-import os
 import json
-import dotenv
-from typing import Dict, Any, cast
+import signal
+from typing import Dict, Any
 
-# Carrega variáveis de ambiente do arquivo .env
-dotenv.load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Importação do cliente SSE do pacote arcee_cli
 from arcee_cli.infrastructure.mcp import MCPRunSSEClient, Evento
+from arcee_cli.examples.mcp.config import ExampleConfig
 
-# Obtém a URL SSE do MCP.run das variáveis de ambiente
-SSE_URL = os.getenv("MCP_SSE_URL")
-if not SSE_URL:
-    print("❌ Erro: Variável de ambiente MCP_SSE_URL não configurada no arquivo .env")
-    sys.exit(1)
+# Lê a configuração do ambiente uma única vez; encerra se MCP_SSE_URL não existir
+CFG = ExampleConfig.load("sse_url")
 
-# Garantindo que SSE_URL é uma string para satisfazer o tipo
-# Como já verificamos que não é None, podemos fazer o cast para str
-SSE_URL = cast(str, SSE_URL)
+
+def configurar_saida_bufferizada() -> None:
+    """
+    Usa um buffer de 64KB para a saída quando não é um terminal
+    
+    Evita uma chamada write() por linha quando a saída vai para um arquivo de log;
+    processar_evento descarrega o buffer ao fim de cada evento.
+    """
+    if sys.stdout.isatty():
+        return
+    
+    sys.stdout = io.open(
+        sys.stdout.fileno(), "w", buffering=1 << 16, encoding="utf-8", closefd=False
+    )
 
 
 def processar_evento(evento: Evento) -> None:
@@ -44,7 +56,10 @@ def processar_evento(evento: Evento) -> None:
     json_data = evento.json
     if json_data:
         # Formata o JSON para melhor visualização
-        formatted_json = json.dumps(json_data, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            formatted_json = orjson.dumps(json_data, option=orjson.OPT_INDENT_2).decode()
+        else:
+            formatted_json = json.dumps(json_data, ensure_ascii=False, indent=2)
         print(f"Dados (JSON):\n{formatted_json}")
         
         # Extrai informações específicas se disponíveis
@@ -58,15 +73,24 @@ def processar_evento(evento: Evento) -> None:
         print(f"Dados (Raw): {evento.data}")
     
     print("----------------------------")
+    
+    # Um único write por evento; o log não fica defasado entre eventos
+    sys.stdout.flush()
 
 
 def main():
     """Função principal da aplicação"""
+    configurar_saida_bufferizada()
+    
+    # SIGTERM (enviado pelo processo pai) encerra passando pelo finally,
+    # garantindo que o buffer de saída seja descarregado
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     print(f"=== Cliente SSE MCP.run ===")
-    print(f"Conectando ao endpoint: {SSE_URL}")
+    print(f"Conectando ao endpoint: {CFG.sse_url}")
     
     # Cria o cliente SSE com a URL fornecida
-    cliente = MCPRunSSEClient(SSE_URL)
+    cliente = MCPRunSSEClient(CFG.sse_url)
     
     # Inicia a conexão
     if not cliente.iniciar():
@@ -76,6 +100,7 @@ def main():
     print("✅ Cliente SSE iniciado com sucesso")
     print("\nRecebendo eventos em tempo real...")
     print("(Pressione Ctrl+C para encerrar)")
+    sys.stdout.flush()
     
     try:
         # Loop contínuo para processar eventos
@@ -10,28 +10,23 @@ os eventos são processados assincronamente.
 """
 
 import sys
-import os
 import json
-import time
 import signal
 import threading
-import dotenv
-from typing import Dict, Any, cast, Optional
+from typing import Dict, Any, Optional
 
-# Carrega variáveis de ambiente do arquivo .env
-dotenv.load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Importação do cliente SSE do pacote arcee_cli
 from arcee_cli.infrastructure.mcp import MCPRunSSEClient, Evento
+from arcee_cli.examples.mcp.config import ExampleConfig
 
-# Obtém a URL SSE do MCP.run das variáveis de ambiente
-SSE_URL = os.getenv("MCP_SSE_URL")
-if not SSE_URL:
-    print("❌ Erro: Variável de ambiente MCP_SSE_URL não configurada no arquivo .env")
-    sys.exit(1)
-
-# SSE_URL já foi verificado não-nulo acima, então é seguro fazer o cast
-SSE_URL = cast(str, SSE_URL)
+# Lê a configuração do ambiente uma única vez; encerra se MCP_SSE_URL não existir
+CFG = ExampleConfig.load("sse_url")
 
 # Variáveis para controle do serviço em segundo plano
 cliente_sse: Optional[MCPRunSSEClient] = None
@@ -39,6 +34,24 @@ thread_processamento: Optional[threading.Thread] = None
 encerrar_servico = threading.Event()
 
 
+def decodificar_evento(dados: Any) -> Any:
+    """
+    Decodifica os dados de um evento, com o orjson quando disponível
+    
+    Args:
+        dados: Dados brutos do evento (texto JSON ou objeto já decodificado)
+        
+    Returns:
+        Objeto decodificado ou None se os dados não forem JSON
+    """
+    if not isinstance(dados, (str, bytes)):
+        return dados
+    try:
+        return orjson.loads(dados) if ORJSON_AVAILABLE else json.loads(dados)
+    except ValueError:  # orjson.JSONDecodeError e json.JSONDecodeError
+        return None
+
+
 def processar_evento(evento: Evento) -> None:
     """
     Processa um evento recebido do MCP.run
@@ -48,8 +61,8 @@ def processar_evento(evento: Evento) -> None:
     """
     print(f"\n--- Novo Evento [{evento.event_type}] ---")
     
-    # Tenta processar como JSON
-    json_data = evento.json
+    # Tenta processar como JSON; apenas as chaves do nível superior são lidas
+    json_data = decodificar_evento(evento.data)
     if json_data:
         # Formato simplificado para log
         if isinstance(json_data, dict):
@@ -74,9 +87,8 @@ def thread_processamento_eventos() -> None:
     try:
         # Processa eventos enquanto o sinalizador de encerramento não estiver ativo
         while not encerrar_servico.is_set() and cliente_sse.running:
-            cliente_sse.processar_eventos(processar_evento, timeout=0.5)
-            # Pequena pausa para não consumir CPU desnecessariamente
-            time.sleep(0.1)
+            # Bloqueia até chegar um evento (ou 1s), sem pausa extra entre chamadas
+            cliente_sse.processar_eventos(processar_evento, timeout=1.0)
     except Exception as e:
         print(f"❌ Erro no processamento em segundo plano: {e}")
     
@@ -100,7 +112,7 @@ def iniciar_servico_background() -> bool:
     encerrar_servico.clear()
     
     # Cria e inicia o cliente SSE
-    cliente_sse = MCPRunSSEClient(SSE_URL)
+    cliente_sse = MCPRunSSEClient(CFG.sse_url)
     if not cliente_sse.iniciar():
         print("❌ Falha ao iniciar o cliente SSE")
         return False
@@ -138,8 +150,15 @@ def configurar_sinais() -> None:
         encerrar_servico_background()
         sys.exit(0)
     
+    def handler_sigusr1(signum, frame):
+        print("🔄 Serviço SSE em execução")
+    
     # Registra o handler para SIGINT (Ctrl+C)
     signal.signal(signal.SIGINT, handler_sigint)
+    
+    # SIGUSR1 exibe um sinal de vida sob demanda
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, handler_sigusr1)
 
 
 def main() -> int:
@@ -158,12 +177,8 @@ def main() -> int:
     print("(Pressione Ctrl+C para encerrar)")
     
     try:
-        # Simula a aplicação principal fazendo outras tarefas
-        contador = 0
-        while True:
-            contador += 1
-            print(f"Aplicação principal realizando outras tarefas... (ciclo {contador})")
-            time.sleep(3)  # Simula trabalho sendo feito
+        # Aguarda o sinal de encerramento sem acordar a thread principal
+        encerrar_servico.wait()
     except KeyboardInterrupt:
         print("\n\nInterrompido pelo usuário")
     finally:
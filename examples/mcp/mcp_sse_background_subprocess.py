@@ -13,11 +13,11 @@ import sys
 import subprocess
 import signal
 import time
-import dotenv
 import atexit
 
-# Carrega variáveis de ambiente do arquivo .env
-dotenv.load_dotenv()
+# Carrega variáveis de ambiente do arquivo .env (uma vez, compartilhado com subprocessos)
+from arcee_cli.infrastructure.env import load_env
+load_env()
 
 # Verifica se o arquivo de cliente SSE existe
 CLIENTE_SSE_SCRIPT = os.path.join(os.path.dirname(__file__), "mcp_sse_app.py")
@@ -58,7 +58,8 @@ def iniciar_cliente_sse_background():
     
     try:
         # Inicia o processo redirecionando saída para arquivo de log
-        with open("sse_client.log", "w") as log_file:
+        # (O_APPEND: escritas do filho sempre no fim, sem seek entre elas)
+        with open("sse_client.log", "ab") as log_file:
             processo_sse = subprocess.Popen(
                 comando,
                 stdout=log_file,
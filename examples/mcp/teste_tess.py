@@ -5,54 +5,62 @@
 Teste de integração da API TESS com MCP.run
 """
 
-import os
 import sys
 import json
 import subprocess
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from arcee_cli.examples.mcp.config import ExampleConfig, decode_first_json
 
-# Carrega variáveis de ambiente
-load_dotenv()
+# Lê a configuração do ambiente; encerra se a sessão MCP.run ou a chave TESS faltarem
+CFG = ExampleConfig.load("mcp_session", "tess_key")
 
-# Obtém a sessão MCP.run
-MCP_SESSION = os.getenv("MCP_SESSION_ID")
-TESS_API_KEY = os.getenv("TESS_API_KEY")
+# Ferramentas exercitadas pelos testes
+FERRAMENTA_AGENTES = "mcp-server-agno.listar_agentes_tess"
+FERRAMENTA_ARQUIVOS = "mcp-server-agno.listar_arquivos_tess"
 
-if not MCP_SESSION:
-    print("❌ Erro: Variável MCP_SESSION_ID não configurada no arquivo .env")
-    sys.exit(1)
-
-if not TESS_API_KEY:
-    print("❌ Erro: Variável TESS_API_KEY não configurada no arquivo .env")
-    sys.exit(1)
+def executar_ferramenta(ferramenta, params):
+    """Executa uma ferramenta MCP.run enviando os parâmetros pela entrada padrão"""
+    cmd = ["npx", "mcpx", "run", ferramenta, "--file", "/dev/stdin", "--session", CFG.mcp_session]
+    return subprocess.run(cmd, input=json.dumps(params), check=True, text=True, capture_output=True)
 
 def testar_mcp_ferramentas():
-    """Verifica se as ferramentas MCP estão disponíveis"""
+    """
+    Verifica se as ferramentas MCP estão disponíveis
+    
+    Returns:
+        Dicionário de ferramentas da sessão ou None em caso de falha
+    """
     try:
         print("Verificando ferramentas MCP disponíveis...")
-        cmd = f"npx mcpx tools --session {MCP_SESSION}"
-        resultado = subprocess.run(cmd, shell=True, check=True, text=True, capture_output=True)
+        cmd = ["npx", "mcpx", "tools", "--session", CFG.mcp_session]
+        resultado = subprocess.run(cmd, check=True, text=True, capture_output=True)
+        
+        try:
+            ferramentas = decode_first_json(resultado.stdout).get("tools", {})
+        except json.JSONDecodeError:
+            ferramentas = {}
         
-        # Verifica se 'agno' está nas ferramentas disponíveis
-        if "agno" in resultado.stdout.lower():
+        # Verifica se há ferramentas 'agno' entre as disponíveis
+        if any("agno" in nome.lower() for nome in ferramentas):
             print("✅ Ferramenta 'TESS' encontrada no MCP.run")
-            return True
+            return ferramentas
         else:
             print("❌ Ferramenta 'TESS' NÃO encontrada no MCP.run")
             print("   Verifique se o servidor MCP-TESS está em execução")
-            return False
+            return None
     except subprocess.CalledProcessError as e:
         print(f"❌ Erro ao listar ferramentas MCP: {e}")
         print(f"Saída: {e.stderr}")
-        return False
+        return None
 
-def testar_tess_agentes():
+def testar_tess_agentes(ferramentas):
     """Testa a listagem de agentes TESS via MCP.run"""
     try:
         print("\nTestando listagem de agentes TESS...")
-        params = json.dumps({"page": 1, "per_page": 10})
-        cmd = f"npx mcpx run mcp-server-agno.listar_agentes_tess --json '{params}' --session {MCP_SESSION}"
-        resultado = subprocess.run(cmd, shell=True, check=True, text=True, capture_output=True)
+        if FERRAMENTA_AGENTES not in ferramentas:
+            print(f"❌ Ferramenta {FERRAMENTA_AGENTES} não disponível na sessão")
+            return False
+        resultado = executar_ferramenta(FERRAMENTA_AGENTES, {"page": 1, "per_page": 10})
         
         # Verificar se a resposta parece ser uma lista de agentes
         saida = resultado.stdout
@@ -68,13 +76,14 @@ def testar_tess_agentes():
         print(f"Saída: {e.stderr}")
         return False
 
-def testar_tess_arquivos():
+def testar_tess_arquivos(ferramentas):
     """Testa a listagem de arquivos TESS"""
     try:
         print("\nTestando listagem de arquivos TESS...")
-        params = json.dumps({"page": 1, "per_page": 10})
-        cmd = f"npx mcpx run mcp-server-agno.listar_arquivos_tess --json '{params}' --session {MCP_SESSION}"
-        resultado = subprocess.run(cmd, shell=True, check=True, text=True, capture_output=True)
+        if FERRAMENTA_ARQUIVOS not in ferramentas:
+            print(f"❌ Ferramenta {FERRAMENTA_ARQUIVOS} não disponível na sessão")
+            return False
+        resultado = executar_ferramenta(FERRAMENTA_ARQUIVOS, {"page": 1, "per_page": 10})
         
         # Verificar se a resposta parece ser uma lista de arquivos
         saida = resultado.stdout
@@ -94,17 +103,27 @@ def main():
     """Função principal de teste"""
     print("=== Teste de Integração TESS com MCP.run ===\n")
     
-    # Verifica se as ferramentas estão disponíveis
-    if not testar_mcp_ferramentas():
+    # Uma única listagem de ferramentas é reutilizada pelas demais verificações
+    ferramentas = testar_mcp_ferramentas()
+    if ferramentas is None:
         print("\n❌ Teste falhou: Ferramentas MCP não configuradas corretamente")
         return 1
     
-    # Testa a listagem de agentes
-    if not testar_tess_agentes():
+    # As listagens são independentes e limitadas pela inicialização do npx,
+    # então são executadas em paralelo
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futuro_agentes = executor.submit(testar_tess_agentes, ferramentas)
+        futuro_arquivos = executor.submit(testar_tess_arquivos, ferramentas)
+        
+        agentes_ok = futuro_agentes.result()
+        arquivos_ok = futuro_arquivos.result()
+    
+    # Verifica a listagem de agentes
+    if not agentes_ok:
         print("\n⚠️ Aviso: Falha ao listar agentes")
     
-    # Testa a listagem de arquivos
-    if not testar_tess_arquivos():
+    # Verifica a listagem de arquivos
+    if not arquivos_ok:
         print("\n⚠️ Aviso: Falha ao listar arquivos")
     
     print("\n=== Teste Concluído ===")
@@ -1,12 +1,14 @@
 import asyncio
 import os
 import logging
-from typing import Dict, Any, Optional, Union
+import random
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, Optional, Union, Callable, Awaitable
 from datetime import datetime
-import json
+import orjson
 
 from mcp.server.fastmcp import FastMCP, Context, Image
-from rust_backend import create_rust_client
+from rust_backend import get_rust_client
 
 # Configuração de logging
 logging.basicConfig(
@@ -15,12 +17,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger("hybrid-mcp")
 
-# Servidor MCP principal em Python
-mcp = FastMCP("ChatHíbrido")
+# Latência artificial das implementações Python simuladas; MCP_SIMULATE_LATENCY=0 desativa
+SIMULATE_LATENCY = os.environ.get("MCP_SIMULATE_LATENCY", "1") == "1"
 
-# Configuração do cliente Rust
+# Configuração do cliente Rust: uma única instância (e um único pool de
+# conexões) é compartilhada por todas as ferramentas durante a vida do servidor
 RUST_BACKEND_URL = os.environ.get("RUST_BACKEND_URL", "http://localhost:3000")
-rust_client = create_rust_client(RUST_BACKEND_URL)
+rust_client = get_rust_client(RUST_BACKEND_URL)
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Executa a inicialização e o encerramento no mesmo loop de eventos do servidor"""
+    await startup()
+    try:
+        yield
+    finally:
+        await shutdown()
+
+# Servidor MCP principal em Python
+mcp = FastMCP("ChatHíbrido", lifespan=lifespan)
 
 # ----- Implementações Python nativas -----
 
@@ -29,35 +44,57 @@ async def fetch_chat_history_python(chat_id: str) -> str:
     # Simula busca de histórico (em produção, conectaria ao seu banco de dados)
     logger.info(f"Buscando histórico do chat {chat_id} usando backend Python")
     # Simula um atraso de rede
-    await asyncio.sleep(0.2)
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.2)
     return f"Histórico do chat {chat_id} (via Python): Última mensagem em {datetime.now().isoformat()}"
 
 async def search_info_python(query: str) -> str:
     """Implementação Python para busca de informações"""
     logger.info(f"Buscando informações sobre '{query}' usando backend Python")
     # Simula busca (em produção, usaria uma API real)
-    await asyncio.sleep(0.5)
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.5)
     return f"Resultados para '{query}' (via Python): Encontradas 5 referências relevantes."
 
+async def _com_fallback(python_fn: Callable[..., Awaitable[str]],
+                       rust_fn: Callable[..., Awaitable[str]],
+                       *args: Any, falha: str) -> str:
+    """
+    Executa a implementação Python e recorre ao backend Rust se ela falhar
+    
+    Args:
+        python_fn: Implementação Python, tentada primeiro
+        rust_fn: Chamada equivalente no backend Rust
+        args: Argumentos repassados às duas implementações
+        falha: Modelo da mensagem amigável retornada se ambos os backends
+               falharem, formatado com os argumentos apenas nesse caso
+        
+    Returns:
+        Resultado do primeiro backend que responder, ou a mensagem de falha
+    """
+    try:
+        return await python_fn(*args)
+    except Exception as e:
+        logger.warning("Fallback para Rust devido a: %s", e)
+    
+    try:
+        return await rust_fn(*args)
+    except Exception as rust_error:
+        # Se ambos falharem, loga o erro e retorna mensagem amigável
+        logger.error("Ambos os backends falharam. Rust: %s", rust_error)
+        return falha % args
+
 # ----- Recursos MCP -----
 
 @mcp.resource("chat_history://{chat_id}")
 async def get_chat_history(chat_id: str) -> str:
     """Recurso MCP para histórico de chat com fallback"""
-    try:
-        # Tenta usar o backend Python primeiro
-        return await fetch_chat_history_python(chat_id)
-    except Exception as e:
-        # Registra o erro
-        logger.warning(f"Fallback para Rust devido a: {str(e)}")
-        
-        try:
-            # Fallback para o backend Rust
-            return await rust_client.get_chat_history(chat_id)
-        except Exception as rust_error:
-            # Se ambos falharem, loga o erro e retorna mensagem amigável
-            logger.error(f"Ambos os backends falharam. Rust: {str(rust_error)}")
-            return f"Não foi possível recuperar o histórico do chat {chat_id} no momento."
+    return await _com_fallback(
+        fetch_chat_history_python,
+        rust_client.get_chat_history,
+        chat_id,
+        falha="Não foi possível recuperar o histórico do chat %s no momento."
+    )
 
 @mcp.resource("user_profile://{user_id}")
 async def get_user_profile(user_id: str) -> str:
@@ -70,20 +107,12 @@ async def get_user_profile(user_id: str) -> str:
 @mcp.tool()
 async def buscar_informacao(query: str) -> str:
     """Busca informações com fallback para Rust"""
-    try:
-        # Tenta usar o backend Python primeiro
-        return await search_info_python(query)
-    except Exception as e:
-        # Registra o erro e notifica o cliente
-        logger.warning(f"Fallback para Rust devido a: {str(e)}")
-        
-        try:
-            # Fallback para o backend Rust
-            return await rust_client.search_info(query)
-        except Exception as rust_error:
-            # Se ambos falharem, loga o erro e retorna mensagem amigável
-            logger.error(f"Ambos os backends falharam. Rust: {str(rust_error)}")
-            return f"Não foi possível buscar informações sobre '{query}' no momento."
+    return await _com_fallback(
+        search_info_python,
+        rust_client.search_info,
+        query,
+        falha="Não foi possível buscar informações sobre '%s' no momento."
+    )
 
 @mcp.tool()
 async def processar_imagem(image_url: str) -> str:
@@ -92,33 +121,62 @@ async def processar_imagem(image_url: str) -> str:
         # Preferimos o backend Rust para processamento de imagem devido ao desempenho
         logger.info("Processando imagem via backend Rust otimizado")
         result = await rust_client.process_image(image_url)
-        return json.dumps(result)
+        return orjson.dumps(result).decode()
     except Exception as e:
         # Se o Rust falhar, log e retorno amigável (sem fallback para Python neste caso)
         logger.error(f"Falha no processamento de imagem: {str(e)}")
-        return json.dumps({"error": "Não foi possível processar a imagem no momento."})
+        return orjson.dumps({"error": "Não foi possível processar a imagem no momento."}).decode()
+
+# Resposta simulada da implementação Python de chat_completion
+_CHAT_RESPONSE_TMPL = "Resposta para: %s... (via Python)"
+
+# ----- Balanceamento de carga -----
+
+# Requisições em andamento em cada backend
+_inflight = {"python": 0, "rust": 0}
+
+# Fração das requisições distribuídas aleatoriamente, para que um backend
+# ocioso volte a ser testado mesmo que as contagens fiquem empatadas
+EXPLORATION_RATE = 0.1
+
+@contextmanager
+def _em_andamento(backend: str):
+    """Conta a requisição como em andamento no backend enquanto o bloco executa"""
+    _inflight[backend] += 1
+    try:
+        yield
+    finally:
+        _inflight[backend] -= 1
+
+def _escolher_backend() -> str:
+    """Escolhe o backend com menos requisições em andamento (power of two choices)"""
+    candidatos = random.sample(tuple(_inflight), 2)
+    if random.random() < EXPLORATION_RATE:
+        return candidatos[0]
+    return min(candidatos, key=_inflight.__getitem__)
 
 @mcp.tool()
 async def chat_completion(prompt: str, history: Optional[list] = None) -> str:
     """Simulação de chat completion com balanceamento de carga"""
-    # Decisão de balanceamento baseada em carga simples
-    use_rust = len(prompt) > 100  # Envia prompts maiores para Rust (exemplo simples)
-    
-    if use_rust:
-        logger.info("Direcionando para backend Rust devido ao tamanho do prompt")
+    # Direciona para o backend menos carregado no momento
+    if _escolher_backend() == "rust":
+        logger.info("Direcionando para backend Rust (menos requisições em andamento)")
         try:
-            return await rust_client.call_rust_tool("chat_completion", {
-                "prompt": prompt,
-                "history": history or []
-            })
+            with _em_andamento("rust"):
+                return await rust_client.call_rust_tool("chat_completion", {
+                    "prompt": prompt,
+                    "history": history or []
+                })
         except Exception as e:
             # Fallback para Python em caso de erro
             logger.warning(f"Fallback para Python devido a: {str(e)}")
     
     # Implementação Python (ou fallback)
     logger.info(f"Processando chat completion via Python, prompt size: {len(prompt)}")
-    await asyncio.sleep(0.3)  # Simula processamento
-    return f"Resposta para: {prompt[:30]}... (via Python)"
+    with _em_andamento("python"):
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(0.3)  # Simula processamento
+        return _CHAT_RESPONSE_TMPL % (prompt if len(prompt) <= 30 else prompt[:30])
 
 # ----- Prompts MCP -----
 
@@ -146,8 +204,7 @@ async def startup():
     logger.info(f"Inicializando servidor MCP híbrido com backend Rust em {RUST_BACKEND_URL}")
     # Verificar conexão com backend Rust
     try:
-        async with rust_client as client:
-            await client.call_rust_tool("health_check", {})
+        await rust_client.call_rust_tool("health_check", {})
         logger.info("Conexão com backend Rust estabelecida com sucesso")
     except Exception as e:
         logger.warning(f"Aviso: Backend Rust não está disponível: {str(e)}")
@@ -156,16 +213,12 @@ async def startup():
 async def shutdown():
     """Função de encerramento chamada quando o servidor é desligado"""
     logger.info("Encerrando servidor MCP híbrido")
-    # Qualquer limpeza necessária
+    await rust_client.close()
 
 # Iniciar servidor MCP
 if __name__ == "__main__":
     try:
-        # Executar startup de forma síncrona antes de iniciar o servidor
-        import asyncio
-        asyncio.run(startup())
-        
-        # Iniciar o servidor MCP
+        # Iniciar o servidor MCP (startup/shutdown rodam no lifespan)
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Servidor interrompido pelo usuário")
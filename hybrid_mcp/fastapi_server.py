@@ -1,22 +1,64 @@
-from fastapi import FastAPI, Request, HTTPException, Response
+from fastapi import APIRouter, FastAPI, Query, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+import anyio.to_thread
 import uvicorn
-import json
+import orjson
+import msgspec
 import logging
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional, Callable, Awaitable, NamedTuple, Sequence, Tuple, Type
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from datetime import datetime
 import asyncio
+import time
+import itertools
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from functools import lru_cache
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configuração de logging: os handlers publicam numa fila e a escrita em stderr
+# acontece numa thread separada, fora do loop de eventos
+_log_queue = queue.SimpleQueue()
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_output)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
 logger = logging.getLogger("agno-mcp-python")
 
+# Chamadas de ferramentas: todas são registradas em DEBUG; em INFO apenas
+# uma a cada MCP_LOG_SAMPLE_RATE, para o log não crescer com a carga
+LOG_SAMPLE_RATE = max(1, int(os.environ.get("MCP_LOG_SAMPLE_RATE", "1000")))
+_chamadas = itertools.count(1)
+
+def _log_chamada(msg: str, *args: Any) -> None:
+    """Registra uma chamada de ferramenta, com amostragem no nível INFO"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
+    elif next(_chamadas) % LOG_SAMPLE_RATE == 0:
+        logger.info(msg, *args)
+
+# Latência artificial das ferramentas simuladas; MCP_SIMULATE_LATENCY=0 desativa
+# (útil para medir o custo real de despacho e serialização)
+SIMULATE_LATENCY = os.environ.get("MCP_SIMULATE_LATENCY", "1") == "1"
+
+# Tamanho do threadpool usado para o trabalho de CPU fora do loop de eventos
+THREADPOOL_SIZE = int(os.environ.get("THREADPOOL_SIZE", "200"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ajusta o limite de threads do anyio antes de atender requisições"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+
 # Criar aplicação FastAPI
-app = FastAPI(title="TESS MCP Server")
+app = FastAPI(title="TESS MCP Server", lifespan=lifespan)
 
 # Adicionar middleware CORS
 app.add_middleware(
@@ -27,6 +69,273 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compacta respostas JSON maiores que 1 KB (listagens e detalhes de agentes);
+# nível 4 mantém o custo de CPU baixo com boa parte do ganho de tamanho
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
+# ----- Catálogos estáticos -----
+
+def _congelar(valor: Any) -> Any:
+    """Converte dicionários e listas aninhados em MappingProxyType e tuplas
+
+    Os catálogos são compartilhados entre requisições; congelados em todos os
+    níveis, nenhum handler consegue alterá-los por acidente.
+    """
+    if isinstance(valor, dict):
+        return MappingProxyType({chave: _congelar(item) for chave, item in valor.items()})
+    if isinstance(valor, list):
+        return tuple(_congelar(item) for item in valor)
+    return valor
+
+# Ferramentas expostas pelo servidor
+TOOLS = [
+    {
+        "name": "health_check",
+        "description": "Verifica a saúde do servidor",
+        "parameters": {}
+    },
+    {
+        "name": "search_info",
+        "description": "Busca informações sobre um tópico",
+        "parameters": {
+            "query": {"type": "string", "description": "Termo de busca"}
+        }
+    },
+    {
+        "name": "process_image",
+        "description": "Processa uma imagem e retorna informações",
+        "parameters": {
+            "url": {"type": "string", "description": "URL da imagem a ser processada"}
+        }
+    },
+    {
+        "name": "chat_completion",
+        "description": "Gera resposta para um prompt",
+        "parameters": {
+            "prompt": {"type": "string", "description": "Texto do prompt"},
+            "history": {"type": "array", "description": "Histórico de conversa (opcional)"}
+        }
+    },
+    {
+        "name": "list_agents",
+        "description": "Lista os agentes disponíveis no sistema",
+        "parameters": {
+            "page": {"type": "number", "description": "Número da página (padrão: 1)"},
+            "per_page": {"type": "number", "description": "Itens por página (padrão: 15, máx: 100)"}
+        }
+    },
+    {
+        "name": "get_agent",
+        "description": "Obtém detalhes de um agente específico",
+        "parameters": {
+            "agent_id": {"type": "string", "description": "ID do agente a ser consultado"}
+        }
+    },
+    {
+        "name": "execute_agent",
+        "description": "Executa um agente com mensagens específicas",
+        "parameters": {
+            "agent_id": {"type": "string", "description": "ID do agente a ser executado"},
+            "model": {"type": "string", "description": "Modelo a ser usado (opcional)"},
+            "tools": {"type": "array", "description": "Ferramentas a serem habilitadas (opcional)"},
+            "messages": {"type": "array", "description": "Mensagens para o agente (formato chat JSON)"},
+            "file_ids": {"type": "array", "description": "IDs dos arquivos a serem anexados (opcional)"},
+            "temperature": {"type": "number", "description": "Temperatura para geração (0-1, padrão: 0.7)"},
+            "wait_execution": {"type": "boolean", "description": "Esperar pela execução completa (padrão: true)"}
+        }
+    },
+    {
+        "name": "list_agent_files",
+        "description": "Lista arquivos associados a um agente",
+        "parameters": {
+            "agent_id": {"type": "string", "description": "ID do agente"},
+            "page": {"type": "number", "description": "Número da página (padrão: 1)"},
+            "per_page": {"type": "number", "description": "Itens por página (padrão: 15, máx: 100)"}
+        }
+    }
+]
+
+# Resumo dos agentes usado na listagem
+ALL_AGENTS: Sequence[Mapping[str, Any]] = _congelar([
+    {
+        "id": "agent-001",
+        "name": "Assistente Geral",
+        "description": "Agente para assistência geral e respostas a perguntas",
+        "capabilities": ["chat", "search", "recommendations"]
+    },
+    {
+        "id": "agent-002",
+        "name": "Especialista em Código",
+        "description": "Agente especializado em programação e desenvolvimento",
+        "capabilities": ["code_review", "debugging", "code_generation"]
+    },
+    {
+        "id": "agent-003",
+        "name": "Analista de Dados",
+        "description": "Agente para análise e visualização de dados",
+        "capabilities": ["data_analysis", "chart_generation", "statistics"]
+    }
+])
+
+# Detalhes dos agentes por ID (os catálogos são somente leitura e compartilhados entre requisições)
+AGENTS: Mapping[str, Mapping[str, Any]] = _congelar({
+    "agent-001": {
+        "id": "agent-001",
+        "name": "Assistente Geral",
+        "description": "Agente para assistência geral e respostas a perguntas",
+        "capabilities": ["chat", "search", "recommendations"],
+        "created_at": "2023-05-15T10:00:00Z",
+        "updated_at": "2023-08-22T14:30:00Z",
+        "version": "1.2.3",
+        "status": "active",
+        "metadata": {
+            "training_data": "general_knowledge_2023",
+            "owner": "tess_team",
+            "language": "pt-br"
+        }
+    },
+    "agent-002": {
+        "id": "agent-002",
+        "name": "Especialista em Código",
+        "description": "Agente especializado em programação e desenvolvimento",
+        "capabilities": ["code_review", "debugging", "code_generation"],
+        "created_at": "2023-06-10T09:15:00Z",
+        "updated_at": "2023-09-05T11:45:00Z",
+        "version": "2.0.1",
+        "status": "active",
+        "metadata": {
+            "training_data": "code_repositories_2023",
+            "owner": "dev_team",
+            "language": "multilingual",
+            "supported_languages": ["python", "javascript", "rust", "go"]
+        }
+    },
+    "agent-003": {
+        "id": "agent-003",
+        "name": "Analista de Dados",
+        "description": "Agente para análise e visualização de dados",
+        "capabilities": ["data_analysis", "chart_generation", "statistics"],
+        "created_at": "2023-07-20T14:20:00Z",
+        "updated_at": "2023-10-12T16:00:00Z",
+        "version": "1.5.0",
+        "status": "active",
+        "metadata": {
+            "training_data": "data_science_2023",
+            "owner": "analytics_team",
+            "language": "multilingual",
+            "data_connectors": ["csv", "json", "sql", "excel"]
+        }
+    }
+})
+
+# Arquivos simulados de cada agente
+AGENT_FILES: Mapping[str, Sequence[Mapping[str, Any]]] = _congelar({
+    "agent-001": [
+        {"id": "file-001", "name": "knowledge_base.txt", "size": 25600, "created_at": "2023-06-15T10:30:00Z", "type": "text"},
+        {"id": "file-002", "name": "faq_responses.json", "size": 15800, "created_at": "2023-07-22T09:45:00Z", "type": "json"},
+        {"id": "file-003", "name": "agent_config.yaml", "size": 4200, "created_at": "2023-05-18T14:20:00Z", "type": "yaml"}
+    ],
+    "agent-002": [
+        {"id": "file-004", "name": "code_examples.py", "size": 18700, "created_at": "2023-06-25T16:40:00Z", "type": "python"},
+        {"id": "file-005", "name": "debugging_guide.md", "size": 22300, "created_at": "2023-08-12T11:35:00Z", "type": "markdown"},
+        {"id": "file-006", "name": "development_patterns.json", "size": 31500, "created_at": "2023-07-08T13:50:00Z", "type": "json"},
+        {"id": "file-007", "name": "error_handling.js", "size": 9800, "created_at": "2023-09-02T10:15:00Z", "type": "javascript"}
+    ],
+    "agent-003": [
+        {"id": "file-008", "name": "data_schema.json", "size": 12400, "created_at": "2023-08-05T15:20:00Z", "type": "json"},
+        {"id": "file-009", "name": "visualization_templates.py", "size": 28900, "created_at": "2023-09-18T12:30:00Z", "type": "python"},
+        {"id": "file-010", "name": "sample_dataset.csv", "size": 156000, "created_at": "2023-07-30T09:10:00Z", "type": "csv"}
+    ]
+})
+
+# Nomes e modelos das respostas simuladas de execute_agent
+AGENT_NAMES: Mapping[str, str] = MappingProxyType({
+    "agent-001": "Assistente Geral",
+    "agent-002": "Especialista em Código",
+    "agent-003": "Analista de Dados"
+})
+_AGENT_RESPONSE_TMPL: Mapping[str, str] = MappingProxyType({
+    "agent-001": "Olá! Sou o Assistente Geral e estou aqui para ajudar com '%s...'",
+    "agent-002": "Como Especialista em Código, posso ajudar com '%s...'. Que linguagem você está usando?",
+    "agent-003": "Analisando sua solicitação: '%s...'. Quais dados você gostaria de processar?"
+})
+_CHAT_RESPONSE_TMPL = "Resposta para: %s... (gerada em %s)"
+
+def _agente_nao_encontrado(agent_id: str) -> HTTPException:
+    """Erro 404 para um agente inexistente"""
+    return HTTPException(status_code=404, detail=f"Agente com ID '{agent_id}' não encontrado")
+
+def _trecho(texto: str, limite: int = 30) -> str:
+    """Início do texto usado nas respostas simuladas; só fatia quando excede o limite"""
+    return texto if len(texto) <= limite else texto[:limite]
+
+def _paginar(items: Sequence[Any], key: str, page: int, per_page: int) -> Dict[str, Any]:
+    """Monta a resposta paginada de uma lista, no formato usado pelas ferramentas de listagem"""
+    start_idx = (page - 1) * per_page
+    return {
+        key: items[start_idx:start_idx + per_page],
+        "total": len(items),
+        "page": page,
+        "per_page": per_page,
+        "total_pages": (len(items) + per_page - 1) // per_page
+    }
+
+def _envelope(valor: Any) -> bytes:
+    """Serializa a resposta no envelope {"body": ...} devolvido por /api/mcp/execute
+
+    Como no plugin XTP em Rust, body é sempre uma string: valores que não são
+    texto vão como JSON serializado dentro dela.
+    """
+    if not isinstance(valor, str):
+        # default=dict serializa os MappingProxyType dos catálogos congelados
+        valor = orjson.dumps(valor, default=dict).decode()
+    return orjson.dumps({"body": valor})
+
+# Os catálogos não mudam: são serializados uma única vez na carga do módulo,
+# já no envelope devolvido por /api/mcp/execute
+_TOOLS_JSON = orjson.dumps({"tools": TOOLS})
+_AGENT_RESPONSE_BY_ID = {agent_id: _envelope(agent) for agent_id, agent in AGENTS.items()}
+
+# Páginas de listagem serializadas sob demanda e guardadas em um LRU; os
+# tamanhos de página mais comuns são pré-carregados na carga do módulo
+_CACHED_PER_PAGE = (15, 25, 50, 100)
+PAGE_CACHE_SIZE = 256
+
+@lru_cache(maxsize=PAGE_CACHE_SIZE)
+def _agents_page_response(page: int, per_page: int) -> bytes:
+    """Resposta serializada de uma página da listagem de agentes"""
+    return _envelope(_paginar(ALL_AGENTS, "agents", page, per_page))
+
+@lru_cache(maxsize=PAGE_CACHE_SIZE)
+def _agent_files_page_response(agent_id: str, page: int, per_page: int) -> bytes:
+    """Resposta serializada de uma página dos arquivos de um agente existente"""
+    page_data = _paginar(AGENT_FILES[agent_id], "files", page, per_page)
+    return _envelope({**page_data, "agent_id": agent_id})
+
+for _per_page in _CACHED_PER_PAGE:
+    for _page in range(1, (len(ALL_AGENTS) + _per_page - 1) // _per_page + 1):
+        _agents_page_response(_page, _per_page)
+    for _agent_id, _files in AGENT_FILES.items():
+        for _page in range(1, (len(_files) + _per_page - 1) // _per_page + 1):
+            _agent_files_page_response(_agent_id, _page, _per_page)
+
+# Timestamps com resolução de 1s: (segundo, ISO 8601, compacto para IDs)
+_ts_cache: Tuple[int, str, str] = (0, "", "")
+
+def _timestamps() -> Tuple[int, str, str]:
+    """Retorna os timestamps do segundo atual, formatados no máximo uma vez por segundo"""
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        dt = datetime.fromtimestamp(now)
+        # Uma única atribuição da tupla mantém o cache consistente entre threads
+        _ts_cache = (now, dt.isoformat(), dt.strftime('%Y%m%d%H%M%S'))
+    return _ts_cache
+
+def _iso_now() -> str:
+    """Timestamp ISO 8601 do segundo atual"""
+    return _timestamps()[1]
+
 # ----- Ferramentas MCP -----
 
 class MCPTools:
@@ -36,23 +345,25 @@ class MCPTools:
         return {
             "status": "ok",
             "message": "TESS proxy server is running (Python/FastAPI)",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
     
     @staticmethod
     async def search_info(query: str) -> str:
         """Implementação de busca de informações"""
-        logger.info(f"Buscando informações para: {query}")
+        _log_chamada("Buscando informações para: %s", query)
         # Simula um processamento
-        await asyncio.sleep(0.5)
-        return f"Resultados para '{query}': Encontrados 5 documentos relevantes em {datetime.now().isoformat()}"
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(0.5)
+        return f"Resultados para '{query}': Encontrados 5 documentos relevantes em {_iso_now()}"
     
     @staticmethod
     async def process_image(url: str) -> Dict[str, Any]:
         """Processamento de imagem"""
-        logger.info(f"Processando imagem em: {url}")
+        _log_chamada("Processando imagem em: %s", url)
         # Simula processamento
-        await asyncio.sleep(1)
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(1)
         return {
             "width": 800,
             "height": 600,
@@ -65,138 +376,32 @@ class MCPTools:
     @staticmethod
     async def chat_completion(prompt: str, history: Optional[list] = None) -> str:
         """Simulação de chat completion"""
-        logger.info(f"Processando chat completion, tamanho do prompt: {len(prompt)}")
+        _log_chamada("Processando chat completion, tamanho do prompt: %d", len(prompt))
         # Simula processamento
-        await asyncio.sleep(0.3)
-        return f"Resposta para: {prompt[:30]}... (gerada em {datetime.now().isoformat()})"
-        
-    @staticmethod
-    async def list_agents(page: int = 1, per_page: int = 15) -> Dict[str, Any]:
-        """Lista os agentes disponíveis no sistema"""
-        logger.info(f"Listando agentes disponíveis (página {page}, {per_page} por página)")
-        # Simula uma lista de agentes
-        all_agents = [
-            {
-                "id": "agent-001",
-                "name": "Assistente Geral",
-                "description": "Agente para assistência geral e respostas a perguntas",
-                "capabilities": ["chat", "search", "recommendations"]
-            },
-            {
-                "id": "agent-002",
-                "name": "Especialista em Código",
-                "description": "Agente especializado em programação e desenvolvimento",
-                "capabilities": ["code_review", "debugging", "code_generation"]
-            },
-            {
-                "id": "agent-003",
-                "name": "Analista de Dados",
-                "description": "Agente para análise e visualização de dados",
-                "capabilities": ["data_analysis", "chart_generation", "statistics"]
-            }
-        ]
-        
-        # Aplicar paginação
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_agents = all_agents[start_idx:end_idx]
-        
-        return {
-            "agents": paginated_agents,
-            "total": len(all_agents),
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (len(all_agents) + per_page - 1) // per_page
-        }
-    
-    @staticmethod
-    async def get_agent(agent_id: str) -> Dict[str, Any]:
-        """Obtém detalhes de um agente específico"""
-        logger.info(f"Obtendo detalhes do agente: {agent_id}")
-        
-        # Simula busca do agente por ID
-        agents = {
-            "agent-001": {
-                "id": "agent-001",
-                "name": "Assistente Geral",
-                "description": "Agente para assistência geral e respostas a perguntas",
-                "capabilities": ["chat", "search", "recommendations"],
-                "created_at": "2023-05-15T10:00:00Z",
-                "updated_at": "2023-08-22T14:30:00Z",
-                "version": "1.2.3",
-                "status": "active",
-                "metadata": {
-                    "training_data": "general_knowledge_2023",
-                    "owner": "tess_team",
-                    "language": "pt-br"
-                }
-            },
-            "agent-002": {
-                "id": "agent-002",
-                "name": "Especialista em Código",
-                "description": "Agente especializado em programação e desenvolvimento",
-                "capabilities": ["code_review", "debugging", "code_generation"],
-                "created_at": "2023-06-10T09:15:00Z",
-                "updated_at": "2023-09-05T11:45:00Z",
-                "version": "2.0.1",
-                "status": "active",
-                "metadata": {
-                    "training_data": "code_repositories_2023",
-                    "owner": "dev_team",
-                    "language": "multilingual",
-                    "supported_languages": ["python", "javascript", "rust", "go"]
-                }
-            },
-            "agent-003": {
-                "id": "agent-003",
-                "name": "Analista de Dados",
-                "description": "Agente para análise e visualização de dados",
-                "capabilities": ["data_analysis", "chart_generation", "statistics"],
-                "created_at": "2023-07-20T14:20:00Z",
-                "updated_at": "2023-10-12T16:00:00Z",
-                "version": "1.5.0",
-                "status": "active",
-                "metadata": {
-                    "training_data": "data_science_2023",
-                    "owner": "analytics_team",
-                    "language": "multilingual",
-                    "data_connectors": ["csv", "json", "sql", "excel"]
-                }
-            }
-        }
-        
-        if agent_id not in agents:
-            raise HTTPException(status_code=404, detail=f"Agente com ID '{agent_id}' não encontrado")
+        if SIMULATE_LATENCY:
+            await asyncio.sleep(0.3)
+        return _CHAT_RESPONSE_TMPL % (_trecho(prompt), _iso_now())
         
-        return agents[agent_id]
-    
     @staticmethod
     async def execute_agent(agent_id: str, model: str = "default", tools: list = None, 
                            messages: list = None, file_ids: list = None, 
                            temperature: float = 0.7, wait_execution: bool = True) -> Dict[str, Any]:
         """Executa um agente com mensagens específicas"""
-        logger.info(f"Executando agente: {agent_id}")
+        _log_chamada("Executando agente: %s", agent_id)
         
         if not messages:
             raise HTTPException(status_code=400, detail="Parâmetro 'messages' é obrigatório")
         
         # Verificar se o agente existe
-        valid_agent_ids = ["agent-001", "agent-002", "agent-003"]
-        if agent_id not in valid_agent_ids:
-            raise HTTPException(status_code=404, detail=f"Agente com ID '{agent_id}' não encontrado")
+        if agent_id not in AGENTS:
+            raise _agente_nao_encontrado(agent_id)
         
         # Simula tempo de processamento baseado no wait_execution
-        if wait_execution:
-            await asyncio.sleep(2.0)  # Simula tempo de processamento completo
-        else:
-            await asyncio.sleep(0.2)  # Resposta rápida para modo assíncrono
-        
-        # Prepara resposta simulada
-        agent_names = {
-            "agent-001": "Assistente Geral",
-            "agent-002": "Especialista em Código",
-            "agent-003": "Analista de Dados"
-        }
+        if SIMULATE_LATENCY:
+            if wait_execution:
+                await asyncio.sleep(2.0)  # Simula tempo de processamento completo
+            else:
+                await asyncio.sleep(0.2)  # Resposta rápida para modo assíncrono
         
         # Determina a última mensagem do usuário
         user_message = "Olá"
@@ -206,16 +411,13 @@ class MCPTools:
                 break
         
         # Gera resposta baseada no tipo de agente
-        responses = {
-            "agent-001": f"Olá! Sou o Assistente Geral e estou aqui para ajudar com '{user_message[:30]}...'",
-            "agent-002": f"Como Especialista em Código, posso ajudar com '{user_message[:30]}...'. Que linguagem você está usando?",
-            "agent-003": f"Analisando sua solicitação: '{user_message[:30]}...'. Quais dados você gostaria de processar?"
-        }
+        template = _AGENT_RESPONSE_TMPL.get(agent_id)
+        message = template % _trecho(user_message) if template else "Processando..."
         
         return {
-            "id": f"execution-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "id": f"execution-{_timestamps()[2]}",
             "agent_id": agent_id,
-            "agent_name": agent_names.get(agent_id, "Desconhecido"),
+            "agent_name": AGENT_NAMES.get(agent_id, "Desconhecido"),
             "status": "completed" if wait_execution else "processing",
             "input": {
                 "model": model,
@@ -224,59 +426,13 @@ class MCPTools:
                 "temperature": temperature
             },
             "output": {
-                "message": responses.get(agent_id, "Processando..."),
-                "timestamp": datetime.now().isoformat(),
+                "message": message,
+                "timestamp": _iso_now(),
                 "tokens_used": 150 + len(user_message),
                 "processing_time_ms": 1850 if wait_execution else 120
             }
         }
     
-    @staticmethod
-    async def list_agent_files(agent_id: str, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
-        """Lista arquivos associados a um agente"""
-        logger.info(f"Listando arquivos do agente {agent_id} (página {page}, {per_page} por página)")
-        
-        # Verificar se o agente existe
-        valid_agent_ids = ["agent-001", "agent-002", "agent-003"]
-        if agent_id not in valid_agent_ids:
-            raise HTTPException(status_code=404, detail=f"Agente com ID '{agent_id}' não encontrado")
-        
-        # Simula arquivos diferentes para cada agente
-        agent_files = {
-            "agent-001": [
-                {"id": "file-001", "name": "knowledge_base.txt", "size": 25600, "created_at": "2023-06-15T10:30:00Z", "type": "text"},
-                {"id": "file-002", "name": "faq_responses.json", "size": 15800, "created_at": "2023-07-22T09:45:00Z", "type": "json"},
-                {"id": "file-003", "name": "agent_config.yaml", "size": 4200, "created_at": "2023-05-18T14:20:00Z", "type": "yaml"}
-            ],
-            "agent-002": [
-                {"id": "file-004", "name": "code_examples.py", "size": 18700, "created_at": "2023-06-25T16:40:00Z", "type": "python"},
-                {"id": "file-005", "name": "debugging_guide.md", "size": 22300, "created_at": "2023-08-12T11:35:00Z", "type": "markdown"},
-                {"id": "file-006", "name": "development_patterns.json", "size": 31500, "created_at": "2023-07-08T13:50:00Z", "type": "json"},
-                {"id": "file-007", "name": "error_handling.js", "size": 9800, "created_at": "2023-09-02T10:15:00Z", "type": "javascript"}
-            ],
-            "agent-003": [
-                {"id": "file-008", "name": "data_schema.json", "size": 12400, "created_at": "2023-08-05T15:20:00Z", "type": "json"},
-                {"id": "file-009", "name": "visualization_templates.py", "size": 28900, "created_at": "2023-09-18T12:30:00Z", "type": "python"},
-                {"id": "file-010", "name": "sample_dataset.csv", "size": 156000, "created_at": "2023-07-30T09:10:00Z", "type": "csv"}
-            ]
-        }
-        
-        files = agent_files.get(agent_id, [])
-        
-        # Aplicar paginação
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_files = files[start_idx:end_idx]
-        
-        return {
-            "files": paginated_files,
-            "total": len(files),
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (len(files) + per_page - 1) // per_page,
-            "agent_id": agent_id
-        }
-
 # ----- Rotas da API -----
 
 @app.get("/health")
@@ -286,188 +442,217 @@ async def health():
     return result
 
 @app.get("/api/mcp/tools")
-async def list_tools(request: Request):
+async def list_tools(session_id: Optional[str] = Query(None)):
     """Lista as ferramentas MCP disponíveis"""
-    session_id = request.query_params.get("session_id")
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id não fornecido")
     
-    # Lista de ferramentas disponíveis
-    tools = [
-        {
-            "name": "health_check",
-            "description": "Verifica a saúde do servidor",
-            "parameters": {}
-        },
-        {
-            "name": "search_info",
-            "description": "Busca informações sobre um tópico",
-            "parameters": {
-                "query": {"type": "string", "description": "Termo de busca"}
-            }
-        },
-        {
-            "name": "process_image",
-            "description": "Processa uma imagem e retorna informações",
-            "parameters": {
-                "url": {"type": "string", "description": "URL da imagem a ser processada"}
-            }
-        },
-        {
-            "name": "chat_completion",
-            "description": "Gera resposta para um prompt",
-            "parameters": {
-                "prompt": {"type": "string", "description": "Texto do prompt"},
-                "history": {"type": "array", "description": "Histórico de conversa (opcional)"}
-            }
-        },
-        {
-            "name": "list_agents",
-            "description": "Lista os agentes disponíveis no sistema",
-            "parameters": {
-                "page": {"type": "number", "description": "Número da página (padrão: 1)"},
-                "per_page": {"type": "number", "description": "Itens por página (padrão: 15, máx: 100)"}
-            }
-        },
-        {
-            "name": "get_agent",
-            "description": "Obtém detalhes de um agente específico",
-            "parameters": {
-                "agent_id": {"type": "string", "description": "ID do agente a ser consultado"}
-            }
-        },
-        {
-            "name": "execute_agent",
-            "description": "Executa um agente com mensagens específicas",
-            "parameters": {
-                "agent_id": {"type": "string", "description": "ID do agente a ser executado"},
-                "model": {"type": "string", "description": "Modelo a ser usado (opcional)"},
-                "tools": {"type": "array", "description": "Ferramentas a serem habilitadas (opcional)"},
-                "messages": {"type": "array", "description": "Mensagens para o agente (formato chat JSON)"},
-                "file_ids": {"type": "array", "description": "IDs dos arquivos a serem anexados (opcional)"},
-                "temperature": {"type": "number", "description": "Temperatura para geração (0-1, padrão: 0.7)"},
-                "wait_execution": {"type": "boolean", "description": "Esperar pela execução completa (padrão: true)"}
-            }
-        },
-        {
-            "name": "list_agent_files",
-            "description": "Lista arquivos associados a um agente",
-            "parameters": {
-                "agent_id": {"type": "string", "description": "ID do agente"},
-                "page": {"type": "number", "description": "Número da página (padrão: 1)"},
-                "per_page": {"type": "number", "description": "Itens por página (padrão: 15, máx: 100)"}
-            }
-        }
-    ]
+    return Response(content=_TOOLS_JSON, media_type="application/json")
+
+# ----- Modelos de requisição -----
+
+class ExecuteRequest(msgspec.Struct):
+    """Corpo de /api/mcp/execute, decodificado direto dos bytes pelo msgspec"""
+    tool: str = ""
+    params: Dict[str, Any] = {}
+
+_EXECUTE_REQUEST_DECODER = msgspec.json.Decoder(ExecuteRequest)
+
+class NoParams(BaseModel):
+    """Ferramentas sem parâmetros"""
+
+class SearchInfoParams(BaseModel):
+    query: str = Field(min_length=1)
+
+class ProcessImageParams(BaseModel):
+    url: str = Field(min_length=1)
+
+class ChatCompletionParams(BaseModel):
+    prompt: str = Field(min_length=1)
+    history: list = []
+
+class PaginationParams(BaseModel):
+    page: int = 1
+    per_page: int = 15
+
+    @field_validator("per_page")
+    @classmethod
+    def _limitar_por_pagina(cls, valor: int) -> int:
+        """Limita a 100 itens por página"""
+        return min(valor, 100)
+
+class GetAgentParams(BaseModel):
+    agent_id: str = Field(min_length=1)
+
+class ExecuteAgentParams(BaseModel):
+    agent_id: str = Field(min_length=1)
+    messages: list = Field(min_length=1)
+    model: str = "default"
+    tools: list = []
+    file_ids: list = []
+    temperature: float = 0.7
+    wait_execution: bool = True
+
+class ListAgentFilesParams(PaginationParams):
+    agent_id: str = Field(min_length=1)
+
+# ----- Tabela de despacho das ferramentas -----
+
+async def _get_agent_response(agent_id: str) -> bytes:
+    """Retorna a resposta com os detalhes do agente já serializada"""
+    _log_chamada("Obtendo detalhes do agente: %s", agent_id)
+    response = _AGENT_RESPONSE_BY_ID.get(agent_id)
+    if response is None:
+        raise _agente_nao_encontrado(agent_id)
+    return response
+
+async def _pagina(build: Callable[..., bytes], per_page: int, *args: Any) -> bytes:
+    """
+    Obtém uma página serializada do LRU
     
-    return {"tools": tools}
+    Os tamanhos de página pré-carregados são respondidos direto no loop de eventos;
+    os demais provavelmente exigem paginar e serializar, trabalho de CPU que é
+    enviado ao threadpool para não bloquear as outras requisições.
+    """
+    if per_page in _CACHED_PER_PAGE:
+        return build(*args)
+    return await run_in_threadpool(build, *args)
 
-@app.post("/api/mcp/execute")
-async def execute_tool(request: Request):
-    """Executa uma ferramenta MCP"""
-    session_id = request.query_params.get("session_id")
+async def _list_agents_response(page: int = 1, per_page: int = 15) -> bytes:
+    """Retorna a resposta com a página de agentes já serializada"""
+    _log_chamada("Listando agentes disponíveis (página %d, %d por página)", page, per_page)
+    return await _pagina(_agents_page_response, per_page, page, per_page)
+
+async def _list_agent_files_response(agent_id: str, page: int = 1, per_page: int = 15) -> bytes:
+    """Retorna a resposta com a página de arquivos do agente já serializada"""
+    _log_chamada("Listando arquivos do agente %s (página %d, %d por página)", agent_id, page, per_page)
+    if agent_id not in AGENT_FILES:
+        raise _agente_nao_encontrado(agent_id)
+    return await _pagina(_agent_files_page_response, per_page, agent_id, page, per_page)
+
+class ToolSpec(NamedTuple):
+    """Descrição de uma ferramenta para o despacho em execute_tool
+
+    O handler retorna o valor do campo "body" ou, em bytes, a resposta
+    completa já serializada.
+    """
+    handler: Callable[..., Awaitable[Any]]
+    # Modelo que valida e converte os parâmetros da ferramenta
+    params: Type[BaseModel] = NoParams
+
+TOOL_REGISTRY: Dict[str, ToolSpec] = {
+    "health_check": ToolSpec(MCPTools.health_check),
+    "search_info": ToolSpec(MCPTools.search_info, SearchInfoParams),
+    "process_image": ToolSpec(MCPTools.process_image, ProcessImageParams),
+    "chat_completion": ToolSpec(MCPTools.chat_completion, ChatCompletionParams),
+    "list_agents": ToolSpec(_list_agents_response, PaginationParams),
+    "get_agent": ToolSpec(_get_agent_response, GetAgentParams),
+    "execute_agent": ToolSpec(MCPTools.execute_agent, ExecuteAgentParams),
+    "list_agent_files": ToolSpec(_list_agent_files_response, ListAgentFilesParams),
+}
+
+def _erro_de_parametro(error: ValidationError) -> HTTPException:
+    """Converte o primeiro erro de validação dos parâmetros em uma resposta 400"""
+    detalhe = error.errors()[0]
+    nome = detalhe["loc"][0] if detalhe["loc"] else "params"
+    if detalhe["type"] in ("missing", "string_too_short", "too_short"):
+        return HTTPException(status_code=400, detail=f"Parâmetro '{nome}' não fornecido")
+    return HTTPException(status_code=400, detail=f"Parâmetro '{nome}' inválido")
+
+def _exigir_sessao(session_id: Optional[str]) -> None:
+    """Rejeita requisições sem session_id"""
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id não fornecido")
+
+async def _executar(tool_name: str, spec: ToolSpec, params: BaseModel) -> Response:
+    """Executa a ferramenta com os parâmetros já validados e monta a resposta"""
+    try:
+        result = await spec.handler(**dict(params))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Erro ao executar ferramenta %s: %s", tool_name, e)
+        raise HTTPException(status_code=500, detail=f"Erro ao executar ferramenta MCP: {str(e)}")
+    
+    # Respostas em cache já chegam serializadas no envelope
+    if not isinstance(result, bytes):
+        result = _envelope(result)
+    return Response(content=result, media_type="application/json")
+
+# Uma rota por ferramenta: o roteamento fica com o Starlette e o corpo
+# (os próprios parâmetros da ferramenta) é validado pelo modelo Pydantic
+router = APIRouter(prefix="/api/mcp/execute")
+
+def _registrar_rota(tool_name: str, spec: ToolSpec) -> None:
+    """Registra POST /api/mcp/execute/<ferramenta> para a ferramenta"""
+    if spec.params is NoParams:
+        async def endpoint(session_id: Optional[str] = Query(None)):
+            _exigir_sessao(session_id)
+            return await _executar(tool_name, spec, NoParams())
+    else:
+        async def endpoint(params: spec.params, session_id: Optional[str] = Query(None)):
+            _exigir_sessao(session_id)
+            return await _executar(tool_name, spec, params)
+    
+    router.add_api_route(f"/{tool_name}", endpoint, methods=["POST"], name=tool_name)
+
+for _tool_name, _spec in TOOL_REGISTRY.items():
+    _registrar_rota(_tool_name, _spec)
+
+@app.post("/api/mcp/execute")
+async def execute_tool(request: Request, session_id: Optional[str] = Query(None)):
+    """Executa uma ferramenta MCP (rota genérica, mantida por compatibilidade)"""
+    _exigir_sessao(session_id)
     
     # Parsear o corpo da requisição
     try:
-        body = await request.json()
-    except json.JSONDecodeError:
+        body = _EXECUTE_REQUEST_DECODER.decode(await request.body())
+    except msgspec.DecodeError:
         raise HTTPException(status_code=400, detail="Corpo da requisição inválido")
     
-    tool_name = body.get("tool")
-    params = body.get("params", {})
-    
+    tool_name = body.tool
     if not tool_name:
         raise HTTPException(status_code=400, detail="Nome da ferramenta não fornecido")
     
-    # Executar a ferramenta correspondente
+    spec = TOOL_REGISTRY.get(tool_name)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Ferramenta '{tool_name}' não encontrada")
+    
+    # Valida e converte os parâmetros com o modelo da ferramenta
     try:
-        if tool_name == "health_check":
-            result = await MCPTools.health_check()
-            return {"body": json.dumps(result)}
-        
-        elif tool_name == "search_info":
-            query = params.get("query")
-            if not query:
-                raise HTTPException(status_code=400, detail="Parâmetro 'query' não fornecido")
-            
-            result = await MCPTools.search_info(query)
-            return {"body": result}
-        
-        elif tool_name == "process_image":
-            url = params.get("url")
-            if not url:
-                raise HTTPException(status_code=400, detail="Parâmetro 'url' não fornecido")
-            
-            result = await MCPTools.process_image(url)
-            return {"body": json.dumps(result)}
-        
-        elif tool_name == "chat_completion":
-            prompt = params.get("prompt")
-            if not prompt:
-                raise HTTPException(status_code=400, detail="Parâmetro 'prompt' não fornecido")
-            
-            history = params.get("history", [])
-            result = await MCPTools.chat_completion(prompt, history)
-            return {"body": result}
-        
-        elif tool_name == "list_agents":
-            page = int(params.get("page", 1))
-            per_page = min(int(params.get("per_page", 15)), 100)  # Limita a 100 por página
-            result = await MCPTools.list_agents(page, per_page)
-            return {"body": json.dumps(result)}
-        
-        elif tool_name == "get_agent":
-            agent_id = params.get("agent_id")
-            if not agent_id:
-                raise HTTPException(status_code=400, detail="Parâmetro 'agent_id' não fornecido")
-            
-            result = await MCPTools.get_agent(agent_id)
-            return {"body": json.dumps(result)}
-        
-        elif tool_name == "execute_agent":
-            agent_id = params.get("agent_id")
-            if not agent_id:
-                raise HTTPException(status_code=400, detail="Parâmetro 'agent_id' não fornecido")
-            
-            messages = params.get("messages")
-            if not messages:
-                raise HTTPException(status_code=400, detail="Parâmetro 'messages' não fornecido")
-            
-            model = params.get("model", "default")
-            tools = params.get("tools", [])
-            file_ids = params.get("file_ids", [])
-            temperature = float(params.get("temperature", 0.7))
-            wait_execution = bool(params.get("wait_execution", True))
-            
-            result = await MCPTools.execute_agent(
-                agent_id, model, tools, messages, file_ids, temperature, wait_execution
-            )
-            return {"body": json.dumps(result)}
-        
-        elif tool_name == "list_agent_files":
-            agent_id = params.get("agent_id")
-            if not agent_id:
-                raise HTTPException(status_code=400, detail="Parâmetro 'agent_id' não fornecido")
-            
-            page = int(params.get("page", 1))
-            per_page = min(int(params.get("per_page", 15)), 100)  # Limita a 100 por página
-            
-            result = await MCPTools.list_agent_files(agent_id, page, per_page)
-            return {"body": json.dumps(result)}
-        
-        else:
-            raise HTTPException(status_code=404, detail=f"Ferramenta '{tool_name}' não encontrada")
+        params = spec.params.model_validate(body.params)
+    except ValidationError as e:
+        raise _erro_de_parametro(e)
     
-    except Exception as e:
-        logger.error(f"Erro ao executar ferramenta {tool_name}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Erro ao executar ferramenta MCP: {str(e)}")
+    return await _executar(tool_name, spec, params)
+
+app.include_router(router)
 
 # ----- Iniciar o servidor -----
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "3000"))
-    logger.info(f"Iniciando servidor TESS MCP na porta {port}")
+    logger.info("Iniciando servidor TESS MCP na porta %d", port)
+    
+    workers = int(os.environ.get("WORKERS", "1"))
+    
+    # loop/http "auto" usam uvloop e httptools quando instalados e caem no
+    # asyncio/h11 caso contrário; o log de acesso fica desativado porque as
+    # ferramentas já registram suas próprias chamadas
+    if workers > 1:
+        # Com mais de um worker o uvicorn importa a aplicação pelo nome do módulo,
+        # que vale tanto para "python fastapi_server.py" quanto para "python -m"
+        modulo = __spec__.name if __spec__ else os.path.splitext(os.path.basename(__file__))[0]
+        alvo = f"{modulo}:app"
+    else:
+        alvo = app
     
-    uvicorn.run(app, host="0.0.0.0", port=port) 
\ No newline at end of file
+    uvicorn.run(
+        alvo,
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=workers,
+        access_log=False,
+    )
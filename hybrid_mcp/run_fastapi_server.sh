@@ -1,4 +1,14 @@
 #!/bin/bash
 
 # Executar o servidor FastAPI na porta 3000
-PORT=3000 python fastapi_server.py 
\ No newline at end of file
+# Com SERVER=granian (e o granian instalado) o servidor ASGI em Rust é usado
+# no lugar do uvicorn; WORKERS define o número de processos nos dois casos
+export PORT=${PORT:-3000}
+export WORKERS=${WORKERS:-1}
+
+if [ "$SERVER" = "granian" ] && command -v granian >/dev/null 2>&1; then
+    exec granian --interface asgi --host 0.0.0.0 --port "$PORT" \
+        --workers "$WORKERS" --loop uvloop fastapi_server:app
+fi
+
+exec python fastapi_server.py
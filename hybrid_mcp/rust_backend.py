@@ -1,38 +1,68 @@
 import aiohttp
 import asyncio
-import json
+import orjson
+from yarl import URL
 from typing import Dict, Any, Optional, Union
 
+# Limites do pool de conexões mantido com o backend Rust
+MAX_CONNECTIONS = 200
+MAX_CONNECTIONS_PER_HOST = 100
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+REQUEST_TIMEOUT = 10.0
+
 class RustBackendClient:
-    def __init__(self, base_url: str):
+    # Parâmetros de consulta comuns às chamadas internas ao backend
+    _INTERNAL_PARAMS = {"session_id": "internal"}
+    
+    def __init__(self, base_url: str, shared: bool = False):
         self.base_url = base_url
+        # Clientes compartilhados (get_rust_client) só são fechados explicitamente
+        # com close(), no encerramento da aplicação; nunca ao sair de um "async with"
+        self.shared = shared
         self.session = None
+        # URLs já analisadas uma única vez; o aiohttp as usa sem reprocessar a string
+        self._tools_url = URL(f"{base_url}/api/mcp/tools")
+        self._execute_url = URL(f"{base_url}/api/mcp/execute")
     
     async def __aenter__(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        await self.ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if not self.shared:
+            await self.close()
+    
+    async def ensure_session(self):
+        """Garante que existe uma sessão HTTP ativa, com conexões keep-alive reutilizadas entre chamadas"""
+        if not self.session or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MAX_CONNECTIONS,
+                limit_per_host=MAX_CONNECTIONS_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+    
+    async def close(self):
+        """Fecha a sessão HTTP e o pool de conexões"""
         if self.session:
             await self.session.close()
             self.session = None
     
-    async def ensure_session(self):
-        """Garante que existe uma sessão HTTP ativa"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-    
     async def get_chat_history(self, chat_id: str) -> str:
         """Obtém histórico de chat via backend Rust"""
         await self.ensure_session()
         
         async with self.session.get(
-            f"{self.base_url}/api/mcp/tools",
+            self._tools_url,
             params={"session_id": "internal", "resource": f"chat_history://{chat_id}"}
         ) as resp:
             if resp.status == 200:
-                data = await resp.json()
+                data = orjson.loads(await resp.read())
                 return data.get("body", "")
             
             error_text = await resp.text()
@@ -43,12 +73,12 @@ class RustBackendClient:
         await self.ensure_session()
         
         async with self.session.post(
-            f"{self.base_url}/api/mcp/execute",
+            self._execute_url,
             json={"tool": "search_info", "params": {"query": query}},
-            params={"session_id": "internal"}
+            params=self._INTERNAL_PARAMS
         ) as resp:
             if resp.status == 200:
-                data = await resp.json()
+                data = orjson.loads(await resp.read())
                 return data.get("body", "")
             
             error_text = await resp.text()
@@ -59,18 +89,20 @@ class RustBackendClient:
         await self.ensure_session()
         
         async with self.session.post(
-            f"{self.base_url}/api/mcp/execute",
+            self._execute_url,
             json={"tool": "process_image", "params": {"url": image_url}},
-            params={"session_id": "internal"}
+            params=self._INTERNAL_PARAMS
         ) as resp:
             if resp.status == 200:
-                data = await resp.json()
-                try:
-                    if isinstance(data.get("body"), str):
-                        return json.loads(data.get("body", "{}"))
-                    return data.get("body", {})
-                except json.JSONDecodeError:
-                    return {"error": "Formato de resposta inválido", "raw": data.get("body", "")}
+                data = orjson.loads(await resp.read())
+                body = data.get("body", {})
+                # Servidores antigos enviam o corpo como JSON serializado em string
+                if isinstance(body, str):
+                    try:
+                        return orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        return {"error": "Formato de resposta inválido", "raw": body}
+                return body
             
             error_text = await resp.text()
             raise Exception(f"Erro no backend Rust: {resp.status} - {error_text}")
@@ -80,17 +112,30 @@ class RustBackendClient:
         await self.ensure_session()
         
         async with self.session.post(
-            f"{self.base_url}/api/mcp/execute",
+            self._execute_url,
             json={"tool": tool_name, "params": params},
-            params={"session_id": "internal"}
+            params=self._INTERNAL_PARAMS
         ) as resp:
             if resp.status == 200:
-                data = await resp.json()
+                data = orjson.loads(await resp.read())
                 return data.get("body", "")
             
             error_text = await resp.text()
             raise Exception(f"Erro ao chamar ferramenta {tool_name}: {resp.status} - {error_text}")
 
-# Função auxiliar para criar um cliente
+# Um cliente (e portanto uma sessão e um pool de conexões) por URL do backend,
+# compartilhado por todo o processo
+_CLIENTS: Dict[str, RustBackendClient] = {}
+
+def get_rust_client(base_url: str = "http://localhost:3000") -> RustBackendClient:
+    """Retorna o cliente compartilhado para o backend Rust em base_url"""
+    client = _CLIENTS.get(base_url)
+    if client is None:
+        client = _CLIENTS[base_url] = RustBackendClient(base_url, shared=True)
+    return client
+
+# Função auxiliar mantida por compatibilidade: cria um cliente próprio, que pode
+# ser usado com "async with" sem afetar o cliente compartilhado
 def create_rust_client(base_url: str = "http://localhost:3000") -> RustBackendClient:
-    return RustBackendClient(base_url) 
\ No newline at end of file
+    return RustBackendClient(base_url)
+ 
\ No newline at end of file
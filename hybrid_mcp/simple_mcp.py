@@ -3,9 +3,16 @@ import os
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
+import orjson
 
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("simple-mcp")
 
+# Latência artificial das ferramentas simuladas; MCP_SIMULATE_LATENCY=0 desativa
+SIMULATE_LATENCY = os.environ.get("MCP_SIMULATE_LATENCY", "1") == "1"
+
 # Servidor MCP simples
 mcp = FastMCP("MCPSimples")
 
@@ -23,7 +33,8 @@ async def buscar_informacao(query: str) -> str:
     """Busca informações sobre um tópico"""
     logger.info(f"Buscando informações sobre '{query}'")
     # Simula um processamento
-    await asyncio.sleep(0.5)
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.5)
     return f"Resultados para '{query}': Encontradas 5 referências relevantes em {datetime.now().isoformat()}"
 
 @mcp.tool()
@@ -31,7 +42,8 @@ async def processar_imagem(image_url: str) -> str:
     """Processa uma imagem e retorna informações sobre ela"""
     logger.info(f"Processando imagem em {image_url}")
     # Simula processamento
-    await asyncio.sleep(1)
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(1)
     result = {
         "width": 800,
         "height": 600,
@@ -40,14 +52,15 @@ async def processar_imagem(image_url: str) -> str:
         "description": f"Imagem em {image_url} processada com sucesso",
         "tags": ["imagem", "processada", "teste"]
     }
-    return str(result)
+    return orjson.dumps(result).decode()
 
 @mcp.tool()
 async def chat_completion(prompt: str, history: Optional[list] = None) -> str:
     """Simula uma resposta de chat completion"""
     logger.info(f"Processando chat completion, prompt size: {len(prompt)}")
     # Simula processamento
-    await asyncio.sleep(0.3)
+    if SIMULATE_LATENCY:
+        await asyncio.sleep(0.3)
     return f"Resposta para: {prompt[:30]}... (gerada em {datetime.now().isoformat()})"
 
 # ----- Iniciar servidor MCP -----
@@ -60,6 +73,9 @@ if __name__ == "__main__":
         
         # Definir a porta via variável de ambiente conforme recomendado pelo MCP
         os.environ["PORT"] = str(port)
+        # uvloop como loop padrão: o mcp.run() cria o loop a partir da política instalada
+        if UVLOOP_AVAILABLE:
+            uvloop.install()
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Servidor interrompido pelo usuário")
@@ -1,5 +1,9 @@
 from mcp.client.session import ClientSession
 import asyncio
+import time
+
+# Quantidade de chamadas enviadas em lote pela mesma sessão
+NUM_CALLS = 10
 
 async def main():
     # Criar sessão de cliente MCP
@@ -7,15 +11,24 @@ async def main():
         api_url="http://localhost:8000"
     ) as session:
         print("Conectando ao servidor MCP...")
-        
+
         try:
-            # Testar a ferramenta echo
-            response = await session.call_tool("echo", {"text": "Olá, mundo!"})
-            print(f"Resposta: {response}")
-            
+            # Testar a ferramenta echo: as chamadas são independentes, então
+            # são enviadas juntas pela mesma sessão em vez de uma a uma
+            calls = [("echo", {"text": f"Olá, mundo! ({i})"}) for i in range(NUM_CALLS)]
+            inicio = time.perf_counter()
+            responses = await asyncio.gather(
+                *(session.call_tool(tool, params) for tool, params in calls)
+            )
+            duracao = time.perf_counter() - inicio
+
+            for response in responses:
+                print(f"Resposta: {response}")
+            print(f"{len(calls)} chamadas em {duracao:.3f}s")
+
             print("Teste concluído com sucesso!")
         except Exception as e:
             print(f"Erro ao testar o servidor MCP: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+Cache em memória compartilhado pelos provedores TESS
+"""
+
+import os
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Metadados de agentes mudam raramente; listagens e detalhes repetidos são
+# servidos da memória por até AGENT_CACHE_TTL segundos (ajustável pela variável
+# de ambiente TESS_AGENT_CACHE_TTL). invalidate_agents() nos provedores força
+# uma nova consulta antes disso
+AGENT_CACHE_SIZE = 256
+AGENT_CACHE_TTL = float(os.getenv("TESS_AGENT_CACHE_TTL", "300"))
+
+
+class TTLCache:
+    """Cache LRU com expiração por tempo, seguro para uso entre threads
+
+    Os valores são copiados ao entrar e ao sair do cache: um chamador que
+    altere a lista ou o dicionário recebido não afeta os demais.
+    """
+
+    def __init__(self, maxsize: int = AGENT_CACHE_SIZE, ttl: float = AGENT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Retorna o valor armazenado em key, ou None se ausente ou expirado"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: Any, value: Any) -> None:
+        """Armazena value em key, descartando a entrada usada há mais tempo se cheio"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Carregamento único das variáveis de ambiente do arquivo .env
+"""
+
+import os
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+# Marca que o .env já foi carregado; herdada por processos filhos
+ENV_LOADED_FLAG = "ARCEE_ENV_LOADED"
+
+
+@lru_cache(maxsize=None)
+def load_env() -> bool:
+    """
+    Carrega o arquivo .env uma única vez por processo
+
+    Processos filhos iniciados depois do carregamento herdam as variáveis
+    e a marca ENV_LOADED_FLAG, e por isso não leem o arquivo novamente.
+
+    Returns:
+        True se o arquivo .env foi lido neste processo, False caso contrário
+    """
+    if os.environ.get(ENV_LOADED_FLAG):
+        return False
+    loaded = load_dotenv()
+    os.environ[ENV_LOADED_FLAG] = "1"
+    return loaded
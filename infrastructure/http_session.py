@@ -0,0 +1,47 @@
+"""
+Sessões HTTP compartilhadas pelos provedores TESS
+"""
+
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pool de conexões mantido por sessão
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+# Erros de leitura e respostas 502/503/504 só são repetidos em métodos
+# idempotentes (GET). Um POST de execução é repetido apenas em falhas de
+# conexão, quando a requisição nem chegou ao servidor: um timeout de gateway
+# após o agente já ter rodado não reexecuta uma operação cobrada
+RETRY_POLICY = Retry(
+    total=2,
+    connect=2,
+    read=2,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=["GET"]
+)
+
+
+def create_session(headers: Dict[str, str]) -> requests.Session:
+    """Cria uma sessão HTTP que reutiliza conexões TCP/TLS entre chamadas
+
+    Args:
+        headers: Headers enviados em todas as requisições da sessão
+
+    Returns:
+        requests.Session: Sessão com pool de conexões e novas tentativas configurados
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=RETRY_POLICY
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -17,6 +17,9 @@ ARCEE_DIR = os.path.join(HOME_DIR, ".arcee")
 LOG_DIR = os.path.join(ARCEE_DIR, "logs")
 LOG_FILE = os.path.join(LOG_DIR, "arcee.log")
 
+# Indica se configure_logging já foi executado neste processo
+_CONFIGURED = False
+
 # Garantir que os diretórios existam
 def ensure_directories_exist():
     """Garante que os diretórios necessários existam."""
@@ -25,9 +28,17 @@ def ensure_directories_exist():
 def configure_logging(level=logging.INFO):
     """Configura o sistema de logging.
     
+    Chamadas repetidas não instalam novos manipuladores, evitando registros
+    duplicados no console e no arquivo.
+    
     Args:
         level: Nível de logging (padrão: logging.INFO)
     """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return logging.getLogger()
+    _CONFIGURED = True
+    
     ensure_directories_exist()
     
     # Configurar formato de log
@@ -5,31 +5,38 @@
 Fábrica para criar provedores de IA
 """
 
+from functools import lru_cache
 from typing import Optional
-from .arcee_provider import ArceeProvider
-from .tess_provider import TessProvider
-
-# Provedor global para ser reutilizado em diferentes comandos
-_provider = None
 
 
 def get_provider(api_key: Optional[str] = None, api_url: Optional[str] = None):
-    """Retorna uma instância do provedor global"""
-    global _provider
-    
-    if not _provider:
-        try:
-            _provider = ArceeProvider(api_key, api_url)
-        except Exception as e:
-            print(f"❌ Erro ao inicializar provedor: {str(e)}")
-    return _provider
+    """Retorna a instância compartilhada do provedor Arcee para as credenciais informadas"""
+    try:
+        return _shared_arcee_provider(api_key, api_url)
+    except Exception as e:
+        print(f"❌ Erro ao inicializar provedor: {str(e)}")
+        return None
+
+# O provedor Arcee não mantém recursos a fechar, então é reutilizado entre
+# comandos: cada combinação de credenciais é construída uma única vez (falhas
+# não ficam em cache)
+@lru_cache(maxsize=8)
+def _shared_arcee_provider(api_key: Optional[str], api_url: Optional[str]):
+    return create_provider("arcee", api_key, api_url)
 
 def create_provider(provider_type: str, api_key: Optional[str] = None, api_url: Optional[str] = None):
-    """Cria uma instância do provedor solicitado"""
+    """Cria uma instância do provedor solicitado
+
+    Cada chamada devolve uma instância própria, que o chamador pode fechar
+    (TessProvider.close ou "with") sem afetar outros usuários.
+    """
     
+    # Importações tardias: só o provedor efetivamente usado é carregado
     if provider_type.lower() == "arcee":
+        from .arcee_provider import ArceeProvider
         return ArceeProvider(api_key, api_url)
     elif provider_type.lower() == "agno":
+        from .tess_provider import TessProvider
         return TessProvider(api_key, api_url)
     else:
         raise ValueError(f"Provedor não suportado: {provider_type}")
@@ -1,13 +1,89 @@
 import os
 import requests
 import json
+import orjson
 from typing import Dict, List, Optional, Tuple, Any
 import logging
+import threading
+from collections import OrderedDict
+from ..cache import TTLCache
+from ..http_session import create_session
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - habilita HTTP/2 no httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Timeout (conexão, leitura) da execução: falhas de conexão são detectadas
+# rápido, enquanto respostas longas do LLM ainda têm tempo de chegar
+EXECUTE_TIMEOUT = (5, 60)
+
+# Cache semântico de execuções: prompts parafraseados reaproveitam a resposta
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_SIZE = 1000
+SEMANTIC_CACHE_THRESHOLD = 0.85
+
+class SemanticCache:
+    """Respostas de agentes indexadas pela similaridade de cosseno do prompt
+
+    Só reaproveita respostas do mesmo agente executado com os mesmos parâmetros.
+    numpy e sentence-transformers são importados apenas aqui, quando o cache é
+    criado; sem eles, a criação levanta ImportError.
+    """
+
+    def __init__(self, model_name: str = SEMANTIC_CACHE_MODEL,
+                 maxsize: int = SEMANTIC_CACHE_SIZE, threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+        
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._np = np
+        self._model = SentenceTransformer(model_name)
+        self._entries: "OrderedDict[int, Tuple[str, Any, Dict]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, agent_id: str, params: Dict[str, Any], prompt: str) -> Tuple[Optional[Dict], Tuple[str, Any]]:
+        """Procura uma resposta para um prompt semelhante
+
+        Returns:
+            Tuple: Resposta em cache (ou None) e a chave a passar para store
+        """
+        scope = f"{agent_id}:{json.dumps(params, sort_keys=True, default=str)}"
+        # Embeddings normalizados: o produto escalar já é a similaridade de cosseno
+        emb = self._model.encode(prompt, normalize_embeddings=True)
+        with self._lock:
+            ids = [i for i, (s, _, _) in self._entries.items() if s == scope]
+            if ids:
+                sims = self._np.stack([self._entries[i][1] for i in ids]) @ emb
+                best = int(sims.argmax())
+                if sims[best] >= self.threshold:
+                    self._entries.move_to_end(ids[best])
+                    return dict(self._entries[ids[best]][2]), (scope, emb)
+        return None, (scope, emb)
+
+    def store(self, key: Tuple[str, Any], result: Dict) -> None:
+        """Armazena a resposta, descartando a entrada usada há mais tempo se cheio"""
+        scope, emb = key
+        with self._lock:
+            self._entries[self._next_id] = (scope, emb, dict(result))
+            self._next_id += 1
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
 class TessProvider:
-    def __init__(self, api_key: Optional[str] = None, api_url: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, api_url: Optional[str] = None,
+                 enable_semantic_cache: bool = False):
         self.api_key = api_key or os.getenv("TESS_API_KEY")
         self.api_url = api_url or os.getenv("TESS_API_URL", "https://agno.pareto.io/api")
         
@@ -21,14 +97,43 @@ class TessProvider:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # URL base dos endpoints de agentes, montada uma única vez
+        self._agents_url = f"{self.api_url.rstrip('/')}/agents"
+        self._session = create_session(self.headers)
+        self._aclient = None
+        self._agents_cache = TTLCache()
+        
+        # Cache semântico opcional: depende de sentence-transformers e carrega um modelo local
+        self._semantic_cache = None
+        if enable_semantic_cache:
+            try:
+                self._semantic_cache = SemanticCache()
+            except ImportError:
+                logger.warning("sentence-transformers não está instalado; cache semântico desativado")
+
+    def close(self) -> None:
+        """Fecha a sessão HTTP e libera as conexões do pool"""
+        self._session.close()
+
+    def __enter__(self) -> "TessProvider":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def invalidate_agents(self) -> None:
+        """Descarta listagens e detalhes de agentes em cache
+
+        Deve ser chamado após qualquer operação que altere agentes na API TESS.
+        """
+        self._agents_cache.clear()
 
     def health_check(self) -> Tuple[bool, str]:
         """Verifica a conexão com a API TESS tentando listar agentes"""
         try:
-            response = requests.get(
-                f"{self.api_url}/agents",
-                params={"page": 1, "per_page": 1},
-                headers=self.headers
+            response = self._session.get(
+                self._agents_url,
+                params={"page": 1, "per_page": 1}
             )
             
             if response.status_code == 401:
@@ -45,11 +150,15 @@ class TessProvider:
 
     def list_agents(self, page: int = 1, per_page: int = 15) -> List[Dict]:
         """Lista os agentes disponíveis"""
+        key = ("list", page, per_page)
+        cached = self._agents_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(
-                f"{self.api_url}/agents",
-                params={"page": page, "per_page": per_page},
-                headers=self.headers
+            response = self._session.get(
+                self._agents_url,
+                params={"page": page, "per_page": per_page}
             )
             response.raise_for_status()
             
@@ -62,6 +171,7 @@ class TessProvider:
                     'name': agent.get('title'),
                     'description': agent.get('description', '')
                 })
+            self._agents_cache.set(key, agents)
             return agents
             
         except requests.exceptions.RequestException as e:
@@ -70,15 +180,19 @@ class TessProvider:
 
     def get_agent(self, agent_id: str) -> Optional[Dict]:
         """Obtém detalhes de um agente específico"""
+        key = ("agent", agent_id)
+        cached = self._agents_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(
-                f"{self.api_url}/agents/{agent_id}",
-                headers=self.headers
+            response = self._session.get(
+                f"{self._agents_url}/{agent_id}"
             )
             response.raise_for_status()
             
             agent = response.json()
-            return {
+            details = {
                 'id': agent.get('id'),
                 'name': agent.get('title'),
                 'description': agent.get('description', ''),
@@ -86,11 +200,73 @@ class TessProvider:
                 'visibility': agent.get('visibility', ''),
                 'questions': agent.get('questions', [])
             }
+            self._agents_cache.set(key, details)
+            return details
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Erro ao obter agente {agent_id}: {str(e)}")
             return None
             
+    def _build_execute_payload(self, params: Dict[str, Any],
+                               messages: List[Dict[str, str]]) -> Tuple[Dict[str, Any], bool]:
+        """Monta o corpo de /agents/{id}/execute a partir da última mensagem do usuário
+
+        Returns:
+            Tuple: Corpo da requisição e se o modo AUTO está ativo
+        """
+        # Para a API TESS, precisamos extrair a última mensagem do usuário
+        # e usá-la como entrada para o agente
+        last_user_message = next(
+            (msg.get("content", "") for msg in reversed(messages) if msg.get("role") == "user"),
+            ""
+        )
+                
+        if not last_user_message:
+            raise ValueError("Nenhuma mensagem do usuário encontrada no histórico")
+        
+        # Verificar se estamos no modo auto
+        using_auto_mode = params.get("model") == "auto"
+        if using_auto_mode:
+            logger.info("Usando modo AUTO para seleção dinâmica de modelo")
+        
+        # Preparar dados para a requisição
+        # Na API TESS, enviamos o conteúdo do prompt diretamente
+        payload = {
+            **params,  # Parâmetros do agente (nome-empresa, etc)
+            "prompt": last_user_message  # A última mensagem do usuário é o prompt
+        }
+        
+        # Adicionar parâmetros específicos para o modo auto
+        if using_auto_mode:
+            payload["return_model_info"] = True
+        
+        return payload, using_auto_mode
+
+    def _parse_execute_response(self, agent_id: str, params: Dict[str, Any],
+                                response_data: Dict[str, Any], using_auto_mode: bool = False) -> Dict:
+        """Converte a resposta da execução para o formato esperado pelo chat"""
+        # Extrair informações sobre o modelo usado (quando no modo auto)
+        model_used = response_data.get("model_used", None) or params.get("model", "desconhecido")
+        
+        if using_auto_mode and model_used:
+            logger.info(f"Modo AUTO selecionou o modelo: {model_used}")
+        
+        # Na API TESS, a resposta está no campo 'response'
+        return {
+            'content': response_data.get('response', 'Sem resposta do assistente'),
+            'role': 'assistant',
+            'agent_id': agent_id,
+            'model': model_used
+        }
+
+    def _check_execute_status(self, agent_id: str, status_code: int) -> None:
+        """Converte os erros conhecidos da execução em mensagens amigáveis"""
+        if status_code == 401:
+            raise ValueError("Erro de autenticação: verifique sua TESS_API_KEY")
+        
+        if status_code == 404:
+            raise ValueError(f"Agente com ID {agent_id} não encontrado")
+
     def execute_agent(self, agent_id: str, params: Dict[str, Any], messages: List[Dict[str, str]]) -> Dict:
         """Executa um agente com os parâmetros fornecidos e mensagens
 
@@ -102,95 +278,106 @@ class TessProvider:
         Returns:
             Dict: Resposta da execução do agente
         """
+        payload, using_auto_mode = self._build_execute_payload(params, messages)
+        
+        cache_key = None
+        if self._semantic_cache is not None:
+            cached, cache_key = self._semantic_cache.lookup(agent_id, params, payload["prompt"])
+            if cached is not None:
+                logger.debug(f"Resposta do agente {agent_id} obtida do cache semântico")
+                return cached
+        
+        # Serializado uma única vez; o Content-Type JSON já vem dos cabeçalhos da sessão
+        body = orjson.dumps(payload)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Executando agente {agent_id} com payload: {body.decode()}")
+        
         try:
-            # Para a API TESS, precisamos extrair a última mensagem do usuário
-            # e usá-la como entrada para o agente
-            last_user_message = ""
-            for msg in reversed(messages):
-                if msg.get("role") == "user":
-                    last_user_message = msg.get("content", "")
-                    break
-                    
-            if not last_user_message:
-                raise ValueError("Nenhuma mensagem do usuário encontrada no histórico")
-            
-            # Verificar se estamos no modo auto
-            using_auto_mode = params.get("model") == "auto"
-            if using_auto_mode:
-                logger.info("Usando modo AUTO para seleção dinâmica de modelo")
-            
-            # Preparar dados para a requisição
-            # Na API TESS, enviamos o conteúdo do prompt diretamente
-            payload = {
-                **params,  # Parâmetros do agente (nome-empresa, etc)
-                "prompt": last_user_message  # A última mensagem do usuário é o prompt
-            }
-            
-            # Adicionar parâmetros específicos para o modo auto
-            if using_auto_mode:
-                payload["return_model_info"] = True
-            
-            logger.debug(f"Executando agente {agent_id} com payload: {json.dumps(payload)}")
-            
             # Executar o agente
             # O endpoint correto é /agents/{id}/execute 
-            response = requests.post(
-                f"{self.api_url}/agents/{agent_id}/execute",
-                headers=self.headers,
-                json=payload,
-                timeout=60  # Aumentando o timeout para evitar erros por demora na resposta
+            response = self._session.post(
+                f"{self._agents_url}/{agent_id}/execute",
+                data=body,
+                timeout=EXECUTE_TIMEOUT
             )
             
-            if response.status_code == 401:
-                raise ValueError("Erro de autenticação: verifique sua TESS_API_KEY")
-            
-            if response.status_code == 404:
-                raise ValueError(f"Agente com ID {agent_id} não encontrado")
-                
+            self._check_execute_status(agent_id, response.status_code)
             response.raise_for_status()
             
             response_data = response.json()
-            logger.debug(f"Resposta do agente: {json.dumps(response_data)}")
-            
-            # Extrair informações sobre o modelo usado (quando no modo auto)
-            model_used = response_data.get("model_used", None) or params.get("model", "desconhecido")
-            
-            if using_auto_mode and model_used:
-                logger.info(f"Modo AUTO selecionou o modelo: {model_used}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Resposta do agente: {orjson.dumps(response_data).decode()}")
             
             # Retornar o formato compatível com o esperado pelo chat
-            # Na API TESS, a resposta está no campo 'response'
-            return {
-                'content': response_data.get('response', 'Sem resposta do assistente'),
-                'role': 'assistant',
-                'agent_id': agent_id,
-                'model': model_used
-            }
+            result = self._parse_execute_response(agent_id, params, response_data, using_auto_mode)
+            if cache_key is not None:
+                self._semantic_cache.store(cache_key, result)
+            return result
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Erro ao executar agente {agent_id}: {str(e)}")
-            # Tentar novamente com timeout maior apenas para erros de timeout
-            if "timeout" in str(e).lower():
+            raise ValueError(f"Erro ao executar agente: {str(e)}")
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """Retorna o cliente assíncrono, criado na primeira chamada e reutilizado depois"""
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                base_url=self.api_url,
+                headers=self.headers,
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+            )
+        return self._aclient
+
+    async def aexecute_agent(self, agent_id: str, params: Dict[str, Any], messages: List[Dict[str, str]]) -> Dict:
+        """Versão assíncrona de execute_agent, para uso dentro de um loop asyncio
+
+        Usa um único httpx.AsyncClient (HTTP/2 quando o pacote h2 está instalado),
+        sem bloquear o loop de eventos durante a execução do agente.
+
+        Args:
+            agent_id: ID do agente a ser executado
+            params: Dicionário com os parâmetros do agente
+            messages: Lista de mensagens no formato [{role: "user", content: "mensagem"}]
+
+        Returns:
+            Dict: Resposta da execução do agente
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx não está instalado; use execute_agent")
+        
+        payload, using_auto_mode = self._build_execute_payload(params, messages)
+        body = orjson.dumps(payload)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Executando agente {agent_id} com payload: {body.decode()}")
+        client = self._get_async_client()
+        
+        try:
+            response = await client.post(f"/agents/{agent_id}/execute", content=body)
+            self._check_execute_status(agent_id, response.status_code)
+            response.raise_for_status()
+            return self._parse_execute_response(agent_id, params, response.json(), using_auto_mode)
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Erro ao executar agente {agent_id}: {str(e)}")
+            # Repete só falhas de conexão, quando a requisição nem chegou ao
+            # servidor (como a política de retry do caminho síncrono): um
+            # timeout de leitura pode ocorrer com o agente já em execução
+            if isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
                 try:
-                    logger.info(f"Tentando novamente com timeout maior para agente {agent_id}")
-                    response = requests.post(
-                        f"{self.api_url}/agents/{agent_id}/execute",
-                        headers=self.headers,
-                        json=payload,
-                        timeout=120  # Timeout ainda maior para segunda tentativa
-                    )
+                    logger.info(f"Tentando novamente a conexão para agente {agent_id}")
+                    response = await client.post(f"/agents/{agent_id}/execute", content=body)
+                    self._check_execute_status(agent_id, response.status_code)
                     response.raise_for_status()
-                    
-                    response_data = response.json()
-                    model_used = response_data.get("model_used", None) or params.get("model", "desconhecido")
-                    
-                    return {
-                        'content': response_data.get('response', 'Sem resposta do assistente'),
-                        'role': 'assistant',
-                        'agent_id': agent_id,
-                        'model': model_used
-                    }
-                except Exception as retry_error:
+                    return self._parse_execute_response(agent_id, params, response.json(), using_auto_mode)
+                except httpx.HTTPError as retry_error:
                     logger.error(f"Segunda tentativa falhou para agente {agent_id}: {str(retry_error)}")
             
-            raise ValueError(f"Erro ao executar agente: {str(e)}") 
\ No newline at end of file
+            raise ValueError(f"Erro ao executar agente: {str(e)}")
+
+    async def aclose(self) -> None:
+        """Fecha o cliente assíncrono, se tiver sido criado"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
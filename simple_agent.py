@@ -7,6 +7,12 @@ import asyncio
 from dotenv import load_dotenv
 from agno.agent import Agent
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Importar o modelo Arcee
 sys.path.append('/home/agentsai')
 from arcee_cli_agentes_tess.arcee_model import ArceeModel
@@ -61,9 +67,11 @@ async def main():
         print("Digite 'sair' para encerrar a conversa.")
         print("="*50 + "\n")
         
-        # Loop de chat interativo
+        # Loop de chat interativo; a leitura do terminal roda em uma thread
+        # para não bloquear o loop de eventos entre os turnos
+        loop = asyncio.get_running_loop()
         while True:
-            user_input = input("👤 Você: ")
+            user_input = await loop.run_in_executor(None, input, "👤 Você: ")
             
             if user_input.lower() in ["sair", "exit", "quit"]:
                 print("\nEncerrando a conversa. Até mais! 👋")
@@ -100,4 +108,7 @@ async def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    # uvloop reduz o custo de cada operação de I/O do loop de chat
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main()) 
\ No newline at end of file
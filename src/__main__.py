@@ -10,10 +10,7 @@ import click
 from typing import Optional
 from dotenv import load_dotenv
 from .utils.logging import configure_logging
-from .commands.mcp import main_configurar, main_listar, main_executar
-
-# Importar o chat Arcee usando caminho absoluto em vez de relativo
-from crew.arcee_chat import chat as arcee_chat
+from .commands.mcp import main_configurar, main_listar, main_executar, main_executar_lote
 
 # Configurar logging
 configure_logging()
@@ -31,12 +28,15 @@ def cli():
 @cli.command("chat")
 def chat():
     """Inicia um chat interativo com o Arcee AI usando modo AUTO."""
+    # Importação tardia: os comandos MCP não carregam a pilha do chat Arcee
+    from crew.arcee_chat import chat as arcee_chat
     arcee_chat()
 
 # Adicionar alias para facilitar o uso
 @cli.command("conversar")
 def conversar():
     """Alias para o comando 'chat'."""
+    from crew.arcee_chat import chat as arcee_chat
     arcee_chat()
 
 # Cria um grupo de comandos para o MCP
@@ -63,6 +63,12 @@ def mcp_executar(nome: str, params: Optional[str] = None):
     """Executa uma ferramenta MCP.run específica."""
     main_executar(nome, params)
 
+@mcp_group.command("executar-lote")
+@click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))
+def mcp_executar_lote(arquivo: str):
+    """Executa em paralelo as ferramentas listadas em um arquivo JSON."""
+    main_executar_lote(arquivo)
+
 if __name__ == "__main__":
     try:
         cli()
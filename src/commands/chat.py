@@ -6,15 +6,17 @@ Chat com Arcee AI usando o modo AUTO.
 import sys
 import logging
 from ..utils.logging import get_logger, configure_logging
-from crew.arcee_chat import chat as arcee_chat
 
-# Configurar logging
-configure_logging()
 logger = get_logger(__name__)
 
 def main():
     """Função principal que inicia o chat com Arcee AI."""
+    # Sem efeito se a CLI principal já configurou o logging
+    configure_logging()
     try:
+        # Importação tardia da pilha do chat Arcee, carregada só quando usada
+        from crew.arcee_chat import chat as arcee_chat
+        
         # Executa o chat Arcee com modo AUTO
         arcee_chat()
     except Exception as e:
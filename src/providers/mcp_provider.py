@@ -3,16 +3,32 @@ Provedor para interação com o MCP.run.
 """
 
 import os
-import json
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from pathlib import Path
+from ..utils.config import load_json_config, save_json_config, invalidate_config
 
 logger = logging.getLogger(__name__)
 
 # Constantes para a configuração do MCP
 CONFIG_DIR = Path.home() / ".agno"
 MCP_CONFIG_FILE = CONFIG_DIR / "mcp_config.json"
+# Mesmo caminho como str, usado com a API os.path sem construir objetos Path
+_MCP_CONFIG_FILE_STR = str(MCP_CONFIG_FILE)
+
+@lru_cache(maxsize=1)
+def _get_file_session_id() -> Optional[str]:
+    """
+    Lê o ID de sessão do arquivo de configuração uma única vez por processo.
+    
+    O cache é limpo por save_mcp_session_id e clear_mcp_config; erros de
+    leitura não ficam em cache.
+    """
+    session_id = load_json_config(_MCP_CONFIG_FILE_STR).get("session_id")
+    if session_id is not None:
+        logger.info("Usando ID de sessão MCP do arquivo de configuração")
+    return session_id
 
 class MCPProvider:
     """Provedor para interação com o MCP.run."""
@@ -31,16 +47,11 @@ class MCPProvider:
             logger.info("Usando ID de sessão MCP da variável de ambiente")
             return session_id
             
-        # Caso contrário, verifica o arquivo de configuração
-        if MCP_CONFIG_FILE.exists():
-            try:
-                with open(MCP_CONFIG_FILE, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                    if "session_id" in config:
-                        logger.info("Usando ID de sessão MCP do arquivo de configuração")
-                        return config["session_id"]
-            except Exception as e:
-                logger.error(f"Erro ao ler configuração do MCP: {str(e)}")
+        # Caso contrário, usa o arquivo de configuração (lido uma vez por processo)
+        try:
+            return _get_file_session_id()
+        except Exception as e:
+            logger.error("Erro ao ler configuração do MCP: %s", e)
                 
         return None
         
@@ -56,29 +67,24 @@ class MCPProvider:
             bool: True se salvou com sucesso, False caso contrário
         """
         try:
-            # Garante que o diretório de configuração existe
-            CONFIG_DIR.mkdir(exist_ok=True, parents=True)
-            
             # Lê a configuração atual, se existir
             config = {}
-            if MCP_CONFIG_FILE.exists():
-                try:
-                    with open(MCP_CONFIG_FILE, "r", encoding="utf-8") as f:
-                        config = json.load(f)
-                except:
-                    logger.warning("Arquivo de configuração existente não pôde ser lido. Criando novo.")
+            try:
+                config = dict(load_json_config(_MCP_CONFIG_FILE_STR))
+            except:
+                logger.warning("Arquivo de configuração existente não pôde ser lido. Criando novo.")
             
             # Atualiza a configuração
             config["session_id"] = session_id
             
             # Salva a configuração
-            with open(MCP_CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2)
+            save_json_config(_MCP_CONFIG_FILE_STR, config)
+            _get_file_session_id.cache_clear()
                 
-            logger.info(f"ID de sessão MCP salvo com sucesso em {MCP_CONFIG_FILE}")
+            logger.info("ID de sessão MCP salvo com sucesso em %s", MCP_CONFIG_FILE)
             return True
         except Exception as e:
-            logger.error(f"Erro ao salvar configuração do MCP: {str(e)}")
+            logger.error("Erro ao salvar configuração do MCP: %s", e)
             return False
             
     @staticmethod
@@ -100,10 +106,12 @@ class MCPProvider:
             bool: True se limpou com sucesso, False caso contrário
         """
         try:
-            if MCP_CONFIG_FILE.exists():
-                MCP_CONFIG_FILE.unlink()
+            if os.path.exists(_MCP_CONFIG_FILE_STR):
+                os.remove(_MCP_CONFIG_FILE_STR)
+                invalidate_config(_MCP_CONFIG_FILE_STR)
                 logger.info("Configuração do MCP removida com sucesso")
+            _get_file_session_id.cache_clear()
             return True
         except Exception as e:
-            logger.error(f"Erro ao limpar configuração do MCP: {str(e)}")
+            logger.error("Erro ao limpar configuração do MCP: %s", e)
             return False 
\ No newline at end of file
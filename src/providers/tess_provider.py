@@ -4,17 +4,97 @@ Provedor para interação com a API do TESS.
 
 import os
 import requests
-import json
+import orjson
 import logging
+import asyncio
+from functools import partial
+import urllib3
 from typing import Dict, List, Any, Tuple, Optional
+from infrastructure.cache import TTLCache
+from infrastructure.http_session import create_session
 from ..utils.logging import get_logger
 
 # Configuração de logger
 logger = get_logger(__name__)
 
+# Resultado da importação do cliente MCP: (disponível, MCPRunClient, MCPProvider).
+# A importação só acontece quando o MCP é usado pela primeira vez, de modo que
+# importar o provedor não carrega o mcpx_simple (nem o seu load_dotenv)
+_MCP_IMPORT_CACHED: Optional[Tuple[bool, Any, Any]] = None
+
+def _load_mcp() -> Tuple[bool, Any, Any]:
+    """Importa o cliente MCP na primeira chamada e reutiliza o resultado."""
+    global _MCP_IMPORT_CACHED
+    if _MCP_IMPORT_CACHED is None:
+        try:
+            from ..tools.mcpx_simple import MCPRunClient
+            from ..providers.mcp_provider import MCPProvider
+            _MCP_IMPORT_CACHED = (True, MCPRunClient, MCPProvider)
+        except ImportError:
+            _MCP_IMPORT_CACHED = (False, None, None)
+    return _MCP_IMPORT_CACHED
+
+# Respostas a partir deste tamanho (pelo Content-Length) são lidas direto em um
+# buffer pré-alocado; abaixo disso a leitura comum é mais barata
+PREALLOC_MIN_BYTES = 2 * 1024
+
+def read_json_body(response: requests.Response) -> Any:
+    """
+    Lê e decodifica o corpo JSON de uma resposta obtida com stream=True.
+    
+    Quando o tamanho é conhecido e o corpo não está comprimido, os bytes são
+    lidos do socket para um bytearray do tamanho exato, evitando a lista de
+    blocos e a junção feitas por response.content.
+    
+    Args:
+        response: Resposta HTTP ainda não consumida
+        
+    Returns:
+        Conteúdo JSON decodificado
+    """
+    length = int(response.headers.get("Content-Length") or 0)
+    if length < PREALLOC_MIN_BYTES or response.headers.get("Content-Encoding"):
+        return orjson.loads(response.content)
+    
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    try:
+        while received < length:
+            n = response.raw.readinto(view[received:])
+            if not n:
+                break
+            received += n
+    except urllib3.exceptions.HTTPError as e:
+        # Mesmo tratamento do requests ao ler o corpo: vira erro de conexão
+        raise requests.exceptions.ConnectionError(e)
+    return orjson.loads(view[:received])
+
+# Resposta padrão quando o endpoint /chat não está disponível, montada uma única
+# vez; a cada chamada só a mensagem do usuário é inserida
+_FALLBACK_COMMANDS = (
+    "listar ferramentas mcp - Mostra as ferramentas disponíveis",
+    "configurar mcp - Configura o MCP com uma sessão específica",
+    "executar ferramenta <nome> - Executa uma ferramenta MCP específica"
+)
+_FALLBACK_TEMPLATE = (
+    "Olá! Recebi sua mensagem: '{mensagem}'\n\n"
+    "O servidor de chat está online, mas o endpoint de processamento ainda não está completamente implementado.\n\n"
+    "No entanto, você pode usar os seguintes comandos MCP:\n"
+    + "".join(f"- {cmd}\n" for cmd in _FALLBACK_COMMANDS)
+    + "\nExperimente usar um desses comandos para interagir com o MCP!"
+)
+
 class TessProvider:
     """Classe para interagir com a API do TESS."""
     
+    # Atributos fixos: sem __dict__ por instância e com acesso mais rápido
+    __slots__ = (
+        "api_key", "api_url", "local_server_url", "use_local_server", "headers",
+        "_session", "_agents_url", "_local_health_url", "_local_chat_url",
+        "_agents_cache", "_mcp_client", "_mcp_tool_info"
+    )
+    
     def __init__(self):
         """Inicializa o provedor TESS com a API key do ambiente."""
         self.api_key = os.getenv("TESS_API_KEY")
@@ -31,15 +111,97 @@ class TessProvider:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
+        self._session = create_session(self.headers)
+        
+        # URLs usadas a cada chamada, montadas uma única vez
+        self._agents_url = f"{self.api_url.rstrip('/')}/agents"
+        self._local_health_url = f"{self.local_server_url.rstrip('/')}/health"
+        self._local_chat_url = f"{self.local_server_url.rstrip('/')}/chat"
+        
+        # Listagens e detalhes de agentes obtidos recentemente
+        self._agents_cache = TTLCache()
+        
+        # Cliente MCP.run reaproveitado entre chamadas e, para a última lista de
+        # ferramentas obtida, (cliente, instante da consulta, conjunto de nomes,
+        # linhas "- nome")
+        self._mcp_client = None
+        self._mcp_tool_info: Optional[Tuple[Any, Optional[float], frozenset, str]] = None
+        
+        logger.debug("TessProvider inicializado (servidor local: %s)", self.use_local_server)
+        
+    def close(self) -> None:
+        """Fecha a sessão HTTP e libera as conexões do pool."""
+        self._session.close()
+        
+    def __enter__(self) -> "TessProvider":
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+        
+    def invalidate_agents(self) -> None:
+        """
+        Descarta listagens e detalhes de agentes em cache.
+        
+        Deve ser chamado quando os dados da API precisarem ser relidos antes do
+        fim do TTL, por exemplo após alterar agentes.
+        """
+        self._agents_cache.clear()
+        
+    def _get_mcp_client(self):
+        """
+        Retorna o cliente MCP.run da sessão configurada, reaproveitado entre chamadas.
+        
+        Um novo cliente só é criado quando o ID de sessão muda; como o cliente
+        mantém a lista de ferramentas em cache, consultas repetidas a cada turno
+        não geram novas requisições.
+        
+        Returns:
+            MCPRunClient ou None se o MCP não estiver disponível ou configurado
+        """
+        mcp_available, MCPRunClient, MCPProvider = _load_mcp()
+        if not mcp_available:
+            return None
+        
+        session_id = MCPProvider.get_mcp_session_id()
+        if not session_id:
+            return None
+        if self._mcp_client is None or self._mcp_client.session_id != session_id:
+            self._mcp_client = MCPRunClient(session_id=session_id)
+        return self._mcp_client
+        
+    def _get_mcp_tool_names(self, client) -> Tuple[frozenset, str]:
+        """
+        Retorna os nomes das ferramentas MCP disponíveis.
+        
+        O conjunto e a listagem formatada são calculados uma vez por consulta do
+        cliente ao proxy (identificada por tools_fetched_at), e não a cada chamada.
         
-        logger.debug(f"TessProvider inicializado (servidor local: {self.use_local_server})")
+        Args:
+            client: Cliente MCP.run
+            
+        Returns:
+            Tupla (conjunto de nomes, listagem com uma linha "- nome" por ferramenta)
+        """
+        tools = client.get_tools()
+        fetched_at = client.tools_fetched_at
+        info = self._mcp_tool_info
+        if info is None or info[0] is not client or info[1] != fetched_at:
+            names = [tool["name"] for tool in tools if tool.get("name")]
+            info = self._mcp_tool_info = (
+                client,
+                fetched_at,
+                frozenset(names),
+                "\n".join(f"- {name}" for name in names)
+            )
+        return info[2], info[3]
         
     def health_check(self) -> Tuple[bool, str]:
         """Verifica se a API do TESS está disponível."""
         if self.use_local_server:
             try:
-                response = requests.get(
-                    f"{self.local_server_url}/health",
+                response = self._session.get(
+                    self._local_health_url,
                     timeout=10
                 )
                 response.raise_for_status()
@@ -49,9 +211,8 @@ class TessProvider:
                 return False, f"Servidor local indisponível: {str(e)}"
         else:
             try:
-                response = requests.get(
-                    f"{self.api_url}/agents",
-                    headers=self.headers,
+                response = self._session.get(
+                    self._agents_url,
                     params={"per_page": 1},
                     timeout=10
                 )
@@ -72,17 +233,23 @@ class TessProvider:
                 "description": "Assistente local para conversa e consultas"
             }]
         
+        key = ("list", page, per_page)
+        cached = self._agents_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(
-                f"{self.api_url}/agents",
-                headers=self.headers,
+            response = self._session.get(
+                self._agents_url,
                 params={"page": page, "per_page": per_page},
                 timeout=30
             )
             response.raise_for_status()
-            data = response.json()
-            return data.get("data", [])
-        except requests.exceptions.RequestException as e:
+            data = orjson.loads(response.content)
+            agents = data.get("data", [])
+            self._agents_cache.set(key, agents)
+            return agents
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Erro ao listar agentes: {str(e)}")
             return []
     
@@ -98,15 +265,21 @@ class TessProvider:
                 "questions": []
             }
         
+        key = ("agent", agent_id)
+        cached = self._agents_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(
-                f"{self.api_url}/agents/{agent_id}",
-                headers=self.headers,
+            response = self._session.get(
+                f"{self._agents_url}/{agent_id}",
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            agent = orjson.loads(response.content)
+            self._agents_cache.set(key, agent)
+            return agent
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Erro ao obter agente {agent_id}: {str(e)}")
             return None
     
@@ -114,29 +287,32 @@ class TessProvider:
                       messages: List[Dict[str, str]]) -> Dict[str, Any]:
         """Executa um agente com os parâmetros e mensagens fornecidos."""
         
+        # Última mensagem do usuário, localizada uma única vez para os dois modos
+        last_user_message = next(
+            (msg.get("content", "") for msg in reversed(messages) if msg.get("role") == "user"),
+            None
+        )
+        
         if self.use_local_server:
             try:
-                # Obter a última mensagem do usuário
-                last_user_message = None
-                for msg in reversed(messages):
-                    if msg.get("role") == "user":
-                        last_user_message = msg.get("content", "")
-                        break
-                
                 if not last_user_message:
                     return {"content": "Por favor, forneça uma mensagem."}
                 
+                # Parâmetros de geração comuns ao chat_completion do MCP e ao /chat
+                model = params.get("model", "gpt-3.5-turbo")
+                temperature = float(params.get("temperature", 0.7))
+                max_tokens = int(params.get("maxlength", 500))
+                
+                # Cliente MCP da sessão atual, reaproveitado no fallback do /chat
+                mcp_client = None
+                
                 # Verificar se temos o MCP disponível
                 try:
-                    from ..tools.mcpx_simple import MCPRunClient
-                    from ..providers.mcp_provider import MCPProvider
+                    mcp_client = self._get_mcp_client()
                     
-                    # Obter o ID de sessão do MCP
-                    session_id = MCPProvider.get_mcp_session_id()
-                    
-                    if session_id:
+                    if mcp_client:
                         # Tentar usar o chat_completion do MCP diretamente
-                        client = MCPRunClient(session_id=session_id)
+                        client = mcp_client
                         
                         # Preparar mensagens no formato adequado para o chat_completion
                         # Limitamos a 10 mensagens para evitar problemas
@@ -147,9 +323,9 @@ class TessProvider:
                         
                         result = client.run_tool("chat_completion", {
                             "messages": mcp_messages,
-                            "model": params.get("model", "gpt-3.5-turbo"),
-                            "temperature": float(params.get("temperature", 0.7)),
-                            "max_tokens": int(params.get("maxlength", 500))
+                            "model": model,
+                            "temperature": temperature,
+                            "max_tokens": max_tokens
                         })
                         
                         # Verificar se temos uma resposta
@@ -161,10 +337,10 @@ class TessProvider:
                                 return {"content": result["content"], "status": "completed"}
                         else:
                             logger.warning(f"Erro ao usar chat_completion do MCP: {result.get('error', 'Desconhecido')}")
+                    elif not _load_mcp()[0]:
+                        logger.warning("Módulo MCPRunClient não disponível, tentando TESS local")
                     else:
                         logger.warning("Sessão MCP não encontrada, tentando TESS local")
-                except ImportError:
-                    logger.warning("Módulo MCPRunClient não disponível, tentando TESS local")
                 except Exception as e:
                     logger.warning(f"Erro ao usar chat_completion do MCP: {str(e)}")
                 
@@ -172,40 +348,35 @@ class TessProvider:
                 # Preparar a requisição para o servidor local
                 data = {
                     "messages": messages,
-                    "model": params.get("model", "gpt-3.5-turbo"),
-                    "temperature": float(params.get("temperature", 0.7)),
-                    "max_tokens": int(params.get("maxlength", 500))
+                    "model": model,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens
                 }
                 
                 # Fazer a requisição para o servidor local
-                logger.debug(f"Enviando requisição para o servidor local")
-                response = requests.post(
-                    f"{self.local_server_url}/chat",
-                    json=data,
-                    timeout=60
+                logger.debug("Enviando requisição para o servidor local")
+                response = self._session.post(
+                    self._local_chat_url,
+                    data=orjson.dumps(data),
+                    timeout=60,
+                    stream=True
                 )
                 
                 # Se tiver erro 404, use o endpoint /health como fallback para simular resposta
                 if response.status_code == 404:
+                    # O corpo do 404 não é usado
+                    response.close()
+                    
                     # Tentar usar o health_check como ferramenta do MCP
                     try:
-                        from ..tools.mcpx_simple import MCPRunClient
-                        from ..providers.mcp_provider import MCPProvider
-                        
-                        # Obter o ID de sessão do MCP
-                        session_id = MCPProvider.get_mcp_session_id()
-                        
-                        if session_id:
-                            # Criar cliente MCP
-                            client = MCPRunClient(session_id=session_id)
+                        if mcp_client:
+                            # Verificar se a ferramenta health_check existe; a lista
+                            # só é consultada aqui, quando o fallback precisa dela
+                            tool_set, tool_lines = self._get_mcp_tool_names(mcp_client)
                             
-                            # Verificar se a ferramenta health_check existe
-                            tools = client.get_tools()
-                            tool_names = [tool.get('name') for tool in tools]
-                            
-                            if "health_check" in tool_names:
+                            if "health_check" in tool_set:
                                 # Usar health_check para verificar a mensagem
-                                health_result = client.run_tool("health_check", {
+                                health_result = mcp_client.run_tool("health_check", {
                                     "message": last_user_message
                                 })
                                 
@@ -214,7 +385,7 @@ class TessProvider:
                                         "content": f"✅ Sua mensagem foi recebida: '{last_user_message}'\n\n" +
                                                   f"Resposta do servidor: {health_result.get('status', 'OK')}\n" +
                                                   f"Posso usar as seguintes ferramentas MCP:\n" +
-                                                  "\n".join([f"- {name}" for name in tool_names]),
+                                                  tool_lines,
                                         "status": "completed"
                                     }
                     except Exception as e:
@@ -228,8 +399,11 @@ class TessProvider:
                         "status": "completed"
                     }
                 
-                response.raise_for_status()
-                result = response.json()
+                try:
+                    response.raise_for_status()
+                    result = read_json_body(response)
+                finally:
+                    response.close()
                 
                 # Formatar a resposta de acordo com o protocolo esperado
                 return {
@@ -237,7 +411,7 @@ class TessProvider:
                     "status": "completed"
                 }
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
                 logger.error(f"Erro ao comunicar com servidor local: {str(e)}")
                 return {
                     "content": f"Erro de comunicação com o servidor local: {str(e)}. " +
@@ -251,30 +425,23 @@ class TessProvider:
                 "waitExecution": True
             }
             
-            # Se houver mensagens, incluir na última mensagem do usuário
-            if messages:
-                last_user_message = None
-                for msg in reversed(messages):
-                    if msg.get("role") == "user":
-                        last_user_message = msg.get("content", "")
-                        break
-                
-                if last_user_message:
-                    # Adicionar a mensagem ao campo apropriado
-                    # Normalmente seria "texto" para o agente de post LinkedIn
-                    data["texto"] = last_user_message
+            # Se houver mensagem do usuário, incluí-la na requisição
+            if last_user_message:
+                # Adicionar a mensagem ao campo apropriado
+                # Normalmente seria "texto" para o agente de post LinkedIn
+                data["texto"] = last_user_message
             
-            logger.debug(f"Executando agente {agent_id} com params: {json.dumps(data)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executando agente %s com params: %s", agent_id, orjson.dumps(data).decode())
             
             # Fazer requisição para a API
-            response = requests.post(
-                f"{self.api_url}/agents/{agent_id}/execute",
-                headers=self.headers,
-                json=data,
+            response = self._session.post(
+                f"{self._agents_url}/{agent_id}/execute",
+                data=orjson.dumps(data),
                 timeout=60
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             
             # Verificar resultado
             if "responses" in result and len(result["responses"]) > 0:
@@ -291,10 +458,23 @@ class TessProvider:
             # Se não conseguimos extrair a resposta formatada, retornar o resultado bruto
             return {"content": "Não foi possível obter resposta do agente.", "raw": result}
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Erro ao executar agente {agent_id}: {str(e)}")
             raise RuntimeError(f"Erro ao processar solicitação: {str(e)}")
             
+    async def execute_agent_async(self, agent_id: str, params: Dict[str, Any],
+                                  messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Versão assíncrona de execute_agent.
+        
+        A execução roda no executor padrão do loop, usando a mesma sessão HTTP,
+        de modo que várias execuções podem ser aguardadas juntas com asyncio.gather.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.execute_agent, agent_id, params, messages)
+        )
+            
     def _gerar_resposta_fallback(self, mensagem: str, historico: List[Dict[str, str]]) -> str:
         """
         Gera uma resposta de fallback quando o endpoint de chat não está disponível.
@@ -308,21 +488,12 @@ class TessProvider:
         """
         try:
             # Tentar usar ferramentas MCP
-            from ..tools.mcpx_simple import MCPRunClient
-            from ..providers.mcp_provider import MCPProvider
-            
-            # Obter o ID de sessão do MCP
-            session_id = MCPProvider.get_mcp_session_id()
+            client = self._get_mcp_client()
             
-            if session_id:
+            if client:
                 # Tentar usar search_info do MCP
-                client = MCPRunClient(session_id=session_id)
-                
                 # Verificar se a ferramenta search_info existe
-                tools = client.get_tools()
-                tool_names = [tool.get('name') for tool in tools]
-                
-                if "search_info" in tool_names:
+                if client.get_tools(tool_name="search_info"):
                     # Usar search_info para buscar informações relevantes
                     search_result = client.run_tool("search_info", {
                         "query": mensagem
@@ -335,21 +506,4 @@ class TessProvider:
             logger.warning(f"Erro ao usar search_info do MCP: {str(e)}")
         
         # Mensagem de fallback padrão
-        comandos_disponiveis = [
-            "listar ferramentas mcp - Mostra as ferramentas disponíveis",
-            "configurar mcp - Configura o MCP com uma sessão específica",
-            "executar ferramenta <nome> - Executa uma ferramenta MCP específica"
-        ]
-        
-        resposta = (
-            f"Olá! Recebi sua mensagem: '{mensagem}'\n\n"
-            f"O servidor de chat está online, mas o endpoint de processamento ainda não está completamente implementado.\n\n"
-            f"No entanto, você pode usar os seguintes comandos MCP:\n"
-        )
-        
-        for cmd in comandos_disponiveis:
-            resposta += f"- {cmd}\n"
-            
-        resposta += "\nExperimente usar um desses comandos para interagir com o MCP!"
-        
-        return resposta 
\ No newline at end of file
+        return _FALLBACK_TEMPLATE.format(mensagem=mensagem) 
\ No newline at end of file
@@ -428,7 +428,7 @@ class MCPNLProcessor:
         
         try:
             # Configurar MCP
-            new_session_id = configure_mcprun(session_id)
+            new_session_id, _ = configure_mcprun(session_id)
             
             if new_session_id:
                 # Salvar ID de sessão
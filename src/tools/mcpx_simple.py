@@ -5,19 +5,64 @@ Cliente simplificado para interação com o MCP.run através do proxy TESS.
 
 import os
 import json
+import orjson
 import logging
-import requests
-from typing import Dict, Any, List, Optional
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED, FIRST_EXCEPTION
+from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Respostas maiores que isso (em bytes) são analisadas direto do socket com o
+# ijson, sem manter o corpo inteiro em memória antes da conversão
+STREAM_PARSE_THRESHOLD = 256 * 1024
+
+# Sessão HTTP compartilhada por todos os clientes do módulo: conexões TCP/TLS
+# ficam abertas (keep-alive) e são reutilizadas entre clientes e chamadas.
+# É criada na primeira requisição, de modo que importar o módulo não carrega o requests
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def _get_session():
+    """Retorna a sessão HTTP compartilhada, criando-a na primeira chamada."""
+    global _SESSION
+    if _SESSION is not None:
+        return _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            return _SESSION
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+        return _SESSION
+
 class MCPRunClient:
     """Cliente simplificado para o MCP.run usando proxy TESS."""
     
+    # Por quanto tempo (em segundos) a lista de ferramentas obtida é reutilizada
+    TOOLS_TTL = 60.0
+    
     def __init__(self, session_id: Optional[str] = None):
         """
         Inicializa o cliente MCP.
@@ -45,11 +90,24 @@ class MCPRunClient:
             
         if not self.tess_api_key:
             raise ValueError("TESS_API_KEY não configurada")
+        
+        # Headers de autenticação deste cliente, enviados pela sessão compartilhada
+        self._headers = {
+            "Authorization": f"Bearer {self.tess_api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        # Última lista de ferramentas obtida e o instante (monotônico) da consulta
+        self._tools_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
             
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
         Faz uma requisição para o proxy TESS.
         
+        Respostas grandes (acima de STREAM_PARSE_THRESHOLD, segundo o
+        Content-Length) são analisadas incrementalmente com o ijson, quando
+        disponível; as demais são lidas de uma vez e convertidas com o orjson.
+        
         Args:
             method: Método HTTP (GET, POST, etc)
             endpoint: Endpoint da API
@@ -59,11 +117,7 @@ class MCPRunClient:
             Resposta da API
         """
         # Adicionar headers de autenticação
-        headers = kwargs.pop("headers", {})
-        headers.update({
-            "Authorization": f"Bearer {self.tess_api_key}",
-            "Content-Type": "application/json"
-        })
+        headers = {**self._headers, **kwargs.pop("headers", {})}
         
         # Adicionar informações do MCP nos parâmetros
         params = kwargs.pop("params", {})
@@ -74,41 +128,95 @@ class MCPRunClient:
         
         # Fazer requisição
         url = f"{self.api_url}/{endpoint}"
-        response = requests.request(
+        response = _get_session().request(
             method=method,
             url=url,
             headers=headers,
             params=params,
+            stream=True,
             **kwargs
         )
         
-        # Log para debug
-        logger.debug(f"Request URL: {url}")
-        logger.debug(f"Request headers: {headers}")
-        logger.debug(f"Request params: {params}")
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response body: {response.text}")
-        
-        # Verificar resposta
-        response.raise_for_status()
-        return response.json()
+        try:
+            # Log para debug
+            logger.debug(f"Request URL: {url}")
+            logger.debug(f"Request headers: {headers}")
+            logger.debug(f"Request params: {params}")
+            logger.debug(f"Response status: {response.status_code}")
+            
+            # Verificar resposta
+            response.raise_for_status()
+            
+            content_length = int(response.headers.get("Content-Length") or 0)
+            if IJSON_AVAILABLE and content_length > STREAM_PARSE_THRESHOLD:
+                logger.debug(f"Response body: {content_length} bytes, analisado em streaming")
+                # Descomprime gzip/deflate enquanto o ijson lê o corpo
+                response.raw.decode_content = True
+                return next(ijson.items(response.raw, "", use_float=True))
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response body: {response.text}")
+            return orjson.loads(response.content)
+        finally:
+            response.close()
             
-    def get_tools(self) -> List[Dict[str, Any]]:
+    @property
+    def tools_fetched_at(self) -> Optional[float]:
+        """
+        Instante (monotônico) em que a lista de ferramentas em cache foi obtida.
+        
+        Muda a cada nova consulta ao proxy; serve de versão para quem deriva
+        dados da lista, sem comparar o conteúdo. None se ainda não houve consulta.
+        """
+        cache = self._tools_cache
+        return cache[0] if cache is not None else None
+        
+    def get_tools(self, force: bool = False,
+                  tool_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Obtém a lista de ferramentas disponíveis através do proxy TESS.
         
+        A lista completa é reutilizada por até TOOLS_TTL segundos. Com tool_name,
+        apenas a ferramenta indicada é pedida ao proxy (e filtrada também no
+        cliente, para proxies que ignoram o filtro), sem baixar o catálogo todo.
+        
+        Args:
+            force: Ignora a lista em cache e consulta o proxy novamente
+            tool_name: Nome da única ferramenta desejada (opcional)
+        
         Returns:
             Lista de ferramentas
+            
+        Raises:
+            Exception: Em falha HTTP ou se o proxy responder com erro (por
+                exemplo, sessão inválida), em vez de devolver uma lista vazia
         """
+        if not force and self._tools_cache is not None:
+            fetched_at, tools = self._tools_cache
+            if time.monotonic() - fetched_at < self.TOOLS_TTL:
+                if tool_name:
+                    return [t for t in tools if t.get("name") == tool_name]
+                return tools
+        
         try:
             response = self._make_request(
                 method="GET",
-                endpoint="mcp/tools"
+                endpoint="mcp/tools",
+                params={"tool_name": tool_name} if tool_name else {}
             )
             
-            # Processar resposta
-            tools = response.get("tools", [])
+            # Processar resposta: o proxy pode responder 200 com um erro no corpo
+            # (sessão inválida ou expirada), que não deve passar por lista vazia
+            if response.get("error"):
+                raise RuntimeError(f"Proxy TESS recusou a sessão: {response['error']}")
+            tools = response.get("tools")
+            if not isinstance(tools, list):
+                raise RuntimeError("Resposta do proxy TESS sem lista de ferramentas")
+            if tool_name:
+                return [t for t in tools if t.get("name") == tool_name]
+            
             logger.info(f"Obtidas {len(tools)} ferramentas via proxy TESS")
+            self._tools_cache = (time.monotonic(), tools)
             return tools
             
         except Exception as e:
@@ -137,7 +245,7 @@ class MCPRunClient:
             response = self._make_request(
                 method="POST",
                 endpoint="mcp/execute",
-                json=data
+                data=orjson.dumps(data)
             )
             
             logger.info(f"Ferramenta {tool_name} executada via proxy TESS")
@@ -147,33 +255,98 @@ class MCPRunClient:
             logger.error(f"Erro ao executar ferramenta {tool_name} via proxy TESS: {e}")
             raise
 
-def configure_mcprun(session_id: Optional[str] = None) -> Optional[str]:
+    def run_tools_batch(self, calls: List[Dict[str, Any]], max_concurrent: int = 8,
+                        stop_on_error: bool = False, timeout_ms: int = 60000) -> List[Dict[str, Any]]:
+        """
+        Executa várias ferramentas independentes em paralelo através do proxy TESS.
+        
+        Args:
+            calls: Chamadas no formato [{"tool": nome, "parameters": {...}}]
+            max_concurrent: Número máximo de chamadas simultâneas
+            stop_on_error: Cancela as chamadas ainda pendentes na primeira falha
+            timeout_ms: Tempo máximo de espera pelo lote, em milissegundos
+            
+        Returns:
+            Um item por chamada, na ordem de calls: {"index", "tool", "result"}
+            em caso de sucesso ou {"index", "tool", "error"} em caso de falha
+        """
+        if not calls:
+            return []
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_concurrent, len(calls)))
+        try:
+            futures = [
+                executor.submit(self.run_tool, call["tool"], call.get("parameters"))
+                for call in calls
+            ]
+            done, pending = wait(
+                futures,
+                timeout=timeout_ms / 1000,
+                return_when=FIRST_EXCEPTION if stop_on_error else ALL_COMPLETED
+            )
+            for future in pending:
+                future.cancel()
+        finally:
+            executor.shutdown(wait=False)
+        
+        results = []
+        for index, (call, future) in enumerate(zip(calls, futures)):
+            entry = {"index": index, "tool": call["tool"]}
+            if future not in done:
+                entry["error"] = "Chamada não concluída (lote interrompido ou tempo esgotado)"
+            elif future.exception() is not None:
+                entry["error"] = str(future.exception())
+            else:
+                entry["result"] = future.result()
+            results.append(entry)
+        return results
+
+def configure_mcprun(session_id: Optional[str] = None,
+                     saved_session_id: Optional[str] = None
+                     ) -> Tuple[Optional[str], List[Dict[str, Any]]]:
     """
     Configura o cliente MCP.run.
     
+    Os IDs candidatos (argumento, ambiente e configuração salva) são validados
+    em paralelo; vence o primeiro válido nessa ordem de prioridade. A lista de
+    ferramentas obtida na validação é devolvida junto, evitando que o chamador
+    precise consultá-la novamente.
+    
     Args:
         session_id: ID de sessão existente (opcional)
+        saved_session_id: ID de sessão salvo anteriormente (opcional)
         
     Returns:
-        ID de sessão configurado ou None se falhou
+        Tupla (ID de sessão configurado, ferramentas disponíveis), ou (None, [])
+        se falhou
     """
-    try:
-        # Se não foi fornecido, tentar obter do ambiente
-        session_id = session_id or os.getenv("MCP_SESSION_ID")
-        
-        if not session_id:
-            logger.error("ID de sessão MCP não fornecido")
-            return None
-            
-        # Criar cliente para testar configuração
-        client = MCPRunClient(session_id=session_id)
-        
-        # Testar obtendo ferramentas
-        tools = client.get_tools()
+    # Candidatos em ordem de prioridade, sem repetições
+    candidates = list(dict.fromkeys(
+        sid for sid in (session_id, os.getenv("MCP_SESSION_ID"), saved_session_id) if sid
+    ))
+    
+    if not candidates:
+        logger.error("ID de sessão MCP não fornecido")
+        return None, []
+    
+    def _validate(sid: str) -> Tuple[str, List[Dict[str, Any]]]:
+        # Criar cliente e testar obtendo ferramentas
+        tools = MCPRunClient(session_id=sid).get_tools()
         logger.info(f"Encontradas {len(tools)} ferramentas disponíveis via proxy TESS")
-        
-        return session_id
-        
-    except Exception as e:
-        logger.error(f"Erro ao configurar MCP: {e}")
-        return None 
\ No newline at end of file
+        return sid, tools
+    
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    futures = []
+    try:
+        futures = [executor.submit(_validate, sid) for sid in candidates]
+        for future in futures:
+            try:
+                return future.result()
+            except Exception as e:
+                logger.error(f"Erro ao configurar MCP: {e}")
+        return None, []
+    finally:
+        # Validações de menor prioridade ainda pendentes são descartadas
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
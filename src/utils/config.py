@@ -0,0 +1,83 @@
+"""
+Leitura e gravação de arquivos de configuração JSON do CLI Arcee.
+"""
+
+import os
+import orjson
+import tempfile
+from typing import Any, Dict, Set, Tuple, Union
+
+# Tamanho do buffer de E/S usado nos arquivos de configuração e de dados do CLI
+IO_BUFSIZE = 64 * 1024
+
+# Conteúdo já lido de cada arquivo, junto com o mtime e o tamanho observados
+# na leitura; enquanto o arquivo não mudar, não é reaberto nem reanalisado
+_config_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+# Diretórios de configuração já garantidos neste processo
+_ensured_dirs: Set[str] = set()
+
+
+def load_json_config(path: Union[str, "os.PathLike[str]"]) -> Dict[str, Any]:
+    """
+    Lê um arquivo de configuração JSON, reaproveitando a leitura anterior
+    enquanto o arquivo não for alterado.
+
+    Args:
+        path: Caminho do arquivo de configuração
+
+    Returns:
+        Dict: Configuração lida (vazia se o arquivo não existir). O dicionário
+        é compartilhado entre chamadas e não deve ser alterado.
+    """
+    path = os.fspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _config_cache.pop(path, None)
+        return {}
+
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(path, "rb", buffering=IO_BUFSIZE) as f:
+        config = orjson.loads(f.read())
+    _config_cache[path] = (st.st_mtime_ns, st.st_size, config)
+    return config
+
+
+def invalidate_config(path: Union[str, "os.PathLike[str]"]) -> None:
+    """Descarta a leitura em cache de um arquivo, após ele ser regravado ou removido."""
+    _config_cache.pop(os.fspath(path), None)
+
+
+def save_json_config(path: Union[str, "os.PathLike[str]"], config: Dict[str, Any]) -> None:
+    """
+    Grava um arquivo de configuração JSON de forma atômica e atualiza o cache,
+    de modo que a próxima leitura não precise reabrir o arquivo. O diretório
+    do arquivo é criado, se preciso, na primeira gravação do processo.
+
+    Args:
+        path: Caminho do arquivo de configuração
+        config: Configuração a gravar
+    """
+    path = os.fspath(path)
+    config_dir = os.path.dirname(path) or "."
+    if config_dir not in _ensured_dirs:
+        os.makedirs(config_dir, exist_ok=True)
+        _ensured_dirs.add(config_dir)
+    
+    # Grava em um arquivo temporário no mesmo diretório e o move sobre o
+    # original: leitores nunca veem um arquivo parcialmente escrito
+    fd, tmp_path = tempfile.mkstemp(dir=config_dir, suffix=".tmp")
+    try:
+        with open(fd, "wb", buffering=IO_BUFSIZE) as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    st = os.stat(path)
+    _config_cache[path] = (st.st_mtime_ns, st.st_size, config)
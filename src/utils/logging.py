@@ -11,12 +11,20 @@ from logging.handlers import RotatingFileHandler
 LOG_DIR = os.path.expanduser("~/.arcee_cli/logs")
 LOG_FILE = os.path.join(LOG_DIR, "arcee_cli.log")
 
+# Indica se configure_logging já foi executado neste processo
+_CONFIGURED = False
+
 def get_logger(name):
     """Retorna um logger configurado para o módulo especificado."""
     return logging.getLogger(name)
 
 def configure_logging(level=logging.INFO):
-    """Configura o sistema de logging global."""
+    """Configura o sistema de logging global (apenas na primeira chamada)."""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
+    
     # Criar diretório de logs se não existir
     os.makedirs(LOG_DIR, exist_ok=True)
     